@@ -1,5 +1,13 @@
 """Gradio-based Python application for the VoiceForge text preprocessing workflow."""
 
-from .app import create_app
-
 __all__ = ["create_app"]
+
+
+def __getattr__(name: str):
+    # Resolved on first use: spawned cleaning workers import this package and
+    # must not load Gradio or the TTS services with it.
+    if name == "create_app":
+        from .app import create_app
+
+        return create_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
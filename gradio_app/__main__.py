@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from .app import create_app
-
 
 def main() -> None:
+    # Imported here, not at module level: spawned worker processes re-import
+    # this module and only need the lightweight cleaning code.
+    from .app import create_app
+
     app = create_app()
     app.launch()
 
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import asyncio
+import mmap
+import multiprocessing
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 import gradio as gr
 
+from .epub_reader import read_epub_text
 from .llm_service import llm_service
 from .models import (
     CharacterMapping,
@@ -17,15 +25,45 @@ from .models import (
     SpeakerConfig,
     SpeakerMode,
 )
+from .text_cleaner import apply_deterministic_cleaning
 from .text_processor import TextProcessor
 from .tts_services import IndexTTSService, QwenTTSService, VibeVoiceService
 
-try:
-    from ebooklib import epub  # type: ignore
-    from bs4 import BeautifulSoup  # type: ignore
-except Exception:  # noqa: BLE001 - import error will be surfaced during use
-    epub = None  # type: ignore
-    BeautifulSoup = None  # type: ignore
+# Words are counted with str.split() over fixed-size slices: C-speed, but never
+# a list of every word in the book.
+WORD_COUNT_BLOCK = 1 << 16
+# One `Name = SpeakerNumber` entry per line; [^\S\n] is whitespace that stays on the line.
+MAPPING_RE = re.compile(r"^[^\S\n]*([^=\s][^=\n]*?)[^\S\n]*=[^\S\n]*(\d+)[^\S\n]*$", re.M)
+NON_BLANK_LINE_RE = re.compile(r"\S[^\n]*")
+
+TEXT_CONCURRENCY_LIMIT = int(os.getenv("VOICEFORGE_TEXT_CONCURRENCY", "8"))
+QUEUE_MAX_SIZE = int(os.getenv("VOICEFORGE_QUEUE_MAX_SIZE", "64"))
+# Every speech event shares one slot: the backends compete for the same GPU.
+SPEECH_CONCURRENCY_ID = "speech"
+MAX_UPLOAD_BYTES = int(os.getenv("VOICEFORGE_MAX_UPLOAD_MB", "100")) * 1024 * 1024
+CLEAN_WORKERS = max(1, int(os.getenv("VOICEFORGE_CLEAN_WORKERS", str(min(4, os.cpu_count() or 1)))))
+
+DEFAULT_OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1:8b")
+DEFAULT_QWEN_TTS_MODEL_ID = os.getenv("QWEN_TTS_MODEL_ID", "Qwen/Qwen3-TTS-12Hz-0.6B-Base")
+DEFAULT_QWEN_TTS_LANGUAGE = os.getenv("QWEN_TTS_LANGUAGE", "Auto")
+
+# Dropdown values arrive as plain strings; resolve them with a dict lookup
+# instead of going through Enum.__call__ on every click.
+_SPEAKER_MODES = {mode.value: mode for mode in SpeakerMode}
+_LABEL_FORMATS = {label.value: label for label in LabelFormat}
+_NARRATOR_ATTRIBUTIONS = {attribution.value: attribution for attribution in NarratorAttribution}
+_MODEL_SOURCES = {source.value: source for source in ModelSource}
+
+_SPEAKER_MODE_CHOICES = list(_SPEAKER_MODES)
+_LABEL_FORMAT_CHOICES = list(_LABEL_FORMATS)
+_NARRATOR_ATTRIBUTION_CHOICES = list(_NARRATOR_ATTRIBUTIONS)
+_MODEL_SOURCE_CHOICES = list(_MODEL_SOURCES)
+
+# (HF model field, Ollama model field) visibility for each model source.
+_MODEL_FIELD_UPDATES = {
+    value: (gr.update(visible=source == ModelSource.API), gr.update(visible=source == ModelSource.OLLAMA))
+    for value, source in _MODEL_SOURCES.items()
+}
 
 
 processor = TextProcessor()
@@ -33,27 +71,67 @@ index_tts_service = IndexTTSService()
 vibe_voice_service = VibeVoiceService()
 qwen_tts_service = QwenTTSService()
 
+# Deterministic cleaning is pure-Python regex work that holds the GIL; running
+# it in worker processes keeps one large book from stalling every other session.
+# Workers are sent text_cleaner's function and, with the package __init__ kept
+# lazy, never import Gradio, the LLM clients or the TTS services.
+_clean_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_clean_pool() -> ProcessPoolExecutor:
+    global _clean_pool
+    if _clean_pool is None:
+        # spawn, not fork: the server process already runs Gradio's threads.
+        _clean_pool = ProcessPoolExecutor(
+            max_workers=CLEAN_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _clean_pool
+
+
+def _discard_clean_pool(pool: ProcessPoolExecutor) -> None:
+    # A dead worker breaks the whole pool; start a fresh one on the next click.
+    # Requests that failed on the same pool must not drop its replacement.
+    global _clean_pool
+    if _clean_pool is pool:
+        _clean_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
 
 def _read_txt(path: Path) -> str:
-    return path.read_text(encoding="utf-8")
+    with path.open("rb") as handle:
+        if not os.fstat(handle.fileno()).st_size:
+            return ""
+        # Decode straight from the mapped pages, so the file is never copied
+        # into a full-size bytes object before becoming a str.
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            text = str(mapped, "utf-8", "replace")
+    # Match text-mode reads: the cleaning patterns only know "\n".
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
 
 
 def _read_epub(path: Path) -> str:
-    if epub is None or BeautifulSoup is None:
-        raise RuntimeError("ebooklib and beautifulsoup4 are required for EPUB processing")
-    book = epub.read_epub(str(path))
-    texts: List[str] = []
-    for item in book.get_items():
-        if item.get_type() == epub.ITEM_DOCUMENT:
-            soup = BeautifulSoup(item.get_body_content(), "html.parser")
-            texts.append(soup.get_text(" "))
-    return "\n".join(texts)
-
-
-def _load_file(file: Optional[gr.File]) -> Tuple[str, str]:
-    if file is None:
-        raise gr.Error("No file uploaded")
-    path = Path(file.name)
+    return read_epub_text(path)
+
+
+def _count_words(text: str) -> int:
+    count = 0
+    in_word = False
+    for start in range(0, len(text), WORD_COUNT_BLOCK):
+        block = text[start:start + WORD_COUNT_BLOCK]
+        count += len(block.split())
+        # A word straddling the slice boundary was counted on both sides.
+        if in_word and not block[0].isspace():
+            count -= 1
+        in_word = not block[-1].isspace()
+    return count
+
+
+def _read_upload(path: Path) -> Tuple[str, str]:
     suffix = path.suffix.lower()
     if suffix == ".txt":
         text = _read_txt(path)
@@ -61,11 +139,22 @@ def _load_file(file: Optional[gr.File]) -> Tuple[str, str]:
         text = _read_epub(path)
     else:
         raise gr.Error("Unsupported file type. Please upload a .txt or .epub file.")
-    word_count = len(text.split())
+    word_count = _count_words(text)
     char_count = len(text)
     return text, f"Words: {word_count:,} | Characters: {char_count:,}"
 
 
+async def _load_file(file: Optional[gr.File]) -> Tuple[str, str]:
+    if file is None:
+        raise gr.Error("No file uploaded")
+    path = Path(file.name)
+    if path.stat().st_size > MAX_UPLOAD_BYTES:
+        raise gr.Error(f"File too large (limit {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)")
+    # Decoding and counting a whole book is slow; keep it off the event loop.
+    return await asyncio.to_thread(_read_upload, path)
+
+
+@lru_cache(maxsize=16)
 def _build_cleaning_options(
     replace_smart_quotes: bool,
     fix_ocr_errors: bool,
@@ -86,18 +175,21 @@ def _build_cleaning_options(
     )
 
 
-def _parse_character_mapping(raw: str) -> List[CharacterMapping]:
-    mappings: List[CharacterMapping] = []
-    for line in raw.splitlines():
-        if not line.strip():
-            continue
-        if "=" not in line:
-            raise gr.Error("Invalid character mapping format. Use `Name = SpeakerNumber` per line.")
-        name, number = line.split("=", 1)
-        mappings.append(CharacterMapping(name=name.strip(), speaker_number=int(number.strip())))
+@lru_cache(maxsize=16)
+def _parse_character_mapping(raw: str) -> Tuple[CharacterMapping, ...]:
+    mappings = tuple(
+        CharacterMapping(name=match.group(1), speaker_number=int(match.group(2)))
+        for match in MAPPING_RE.finditer(raw)
+    )
+    # Any non-blank line the pattern skipped is malformed.
+    if len(mappings) != sum(1 for _ in NON_BLANK_LINE_RE.finditer(raw)):
+        raise gr.Error("Invalid character mapping format. Use `Name = SpeakerNumber` per line.")
     return mappings
 
 
+# SpeakerConfig is frozen with tuple fields, so identical settings can safely
+# share one instance across sessions.
+@lru_cache(maxsize=16)
 def _build_speaker_config(
     mode: str,
     speaker_count: int,
@@ -108,21 +200,19 @@ def _build_speaker_config(
     narrator_name: str,
     mapping_text: str,
 ) -> Optional[SpeakerConfig]:
-    selected_mode = SpeakerMode(mode)
+    selected_mode = _SPEAKER_MODES[mode]
     if selected_mode == SpeakerMode.NONE:
         return None
-    config = SpeakerConfig(
+    return SpeakerConfig(
         mode=selected_mode,
         speaker_count=speaker_count,
-        label_format=LabelFormat(label_format),
+        label_format=_LABEL_FORMATS[label_format],
         include_narrator=include_narrator,
-        narrator_attribution=NarratorAttribution(narrator_attribution),
+        narrator_attribution=_NARRATOR_ATTRIBUTIONS[narrator_attribution],
         sample_size=sample_size,
         narrator_character_name=narrator_name or None,
+        character_mapping=_parse_character_mapping(mapping_text),
     )
-    if mapping_text.strip():
-        config.character_mapping = _parse_character_mapping(mapping_text)
-    return config
 
 
 def _build_processing_config(
@@ -137,15 +227,17 @@ def _build_processing_config(
     custom_instructions: str,
     single_pass: bool,
     extended_examples: bool,
+    parallelism: int,
+    max_chunk_tokens: int,
     speaker_config: Optional[SpeakerConfig],
 ) -> ProcessingConfig:
-    if not text.strip():
+    if not text or text.isspace():
         raise gr.Error("Please provide text to process")
     return ProcessingConfig(
         batch_size=batch_size,
         cleaning_options=options,
         speaker_config=speaker_config,
-        model_source=ModelSource(model_source),
+        model_source=_MODEL_SOURCES[model_source],
         model_name=model_name,
         ollama_model_name=ollama_model_name or None,
         temperature=temperature,
@@ -153,12 +245,18 @@ def _build_processing_config(
         custom_instructions=custom_instructions or None,
         single_pass=single_pass,
         extended_examples=extended_examples,
+        parallelism=int(parallelism),
+        max_chunk_tokens=int(max_chunk_tokens),
     )
 
 
 def _format_summary(summary) -> str:
+    if summary.completed_chunks < summary.total_chunks:
+        progress = f"Processed chunks: {summary.completed_chunks} of {summary.total_chunks}"
+    else:
+        progress = f"Total chunks: {summary.total_chunks}"
     lines = [
-        f"Total chunks: {summary.total_chunks}",
+        progress,
         f"Input tokens: {summary.total_input_tokens:,}",
         f"Output tokens: {summary.total_output_tokens:,}",
         f"Estimated cost: ${summary.total_cost:,.4f}",
@@ -168,7 +266,7 @@ def _format_summary(summary) -> str:
     return "\n".join(lines)
 
 
-def run_deterministic(
+async def run_deterministic(
     text: str,
     replace_smart_quotes: bool,
     fix_ocr_errors: bool,
@@ -178,7 +276,7 @@ def run_deterministic(
     add_punctuation: bool,
     fix_hyphenation: bool,
 ) -> Tuple[str, str, str]:
-    if not text.strip():
+    if not text or text.isspace():
         raise gr.Error("Please provide text to clean")
     options = _build_cleaning_options(
         replace_smart_quotes,
@@ -189,7 +287,14 @@ def run_deterministic(
         add_punctuation,
         fix_hyphenation,
     )
-    summary = processor.deterministic_clean(text, options)
+    loop = asyncio.get_running_loop()
+    pool = _get_clean_pool()
+    try:
+        result = await loop.run_in_executor(pool, apply_deterministic_cleaning, text, options)
+    except BrokenProcessPool as exc:
+        _discard_clean_pool(pool)
+        raise gr.Error("The text cleaning worker stopped unexpectedly (out of memory?). Please try again.") from exc
+    summary = TextProcessor.cleaning_summary(result)
     return summary.text, _format_summary(summary), ""
 
 
@@ -211,6 +316,8 @@ def run_processing(
     custom_instructions: str,
     single_pass: bool,
     extended_examples: bool,
+    parallelism: float,
+    max_chunk_tokens: float,
     speaker_mode: str,
     speaker_count: int,
     label_format: str,
@@ -219,7 +326,7 @@ def run_processing(
     sample_size: int,
     narrator_name: str,
     mapping_text: str,
-) -> Tuple[str, str, str]:
+) -> Iterator[Tuple[str, str, str]]:
     options = _build_cleaning_options(
         replace_smart_quotes,
         fix_ocr_errors,
@@ -251,11 +358,12 @@ def run_processing(
         custom_instructions,
         single_pass,
         extended_examples,
+        parallelism,
+        max_chunk_tokens,
         speaker_config,
     )
-    summary = processor.process_text(text, config)
-    logs = "\n".join(summary.logs)
-    return summary.text, _format_summary(summary), logs
+    for summary in processor.iter_process_text(text, config):
+        yield summary.text, _format_summary(summary), "\n".join(summary.logs)
 
 
 def configure_token(token: str) -> str:
@@ -274,7 +382,8 @@ def _coerce_file_path(file_obj) -> Path:
         path = Path(file_obj)
     else:
         raise gr.Error("Unsupported file input")
-    if not path.exists():
+    # One stat per path; a directory left behind by a failed upload is rejected too.
+    if not path.is_file():
         raise gr.Error(f"File not found: {path}")
     return path
 
@@ -288,32 +397,30 @@ def _coerce_file_paths(file_objs) -> List[Path]:
 
 
 def _toggle_model_fields(source: str):
-    selected = ModelSource(source)
-    return (
-        gr.update(visible=selected == ModelSource.API),
-        gr.update(visible=selected == ModelSource.OLLAMA),
-    )
+    return _MODEL_FIELD_UPDATES[source]
 
 
-def run_indextts_download() -> Tuple[str, str]:
-    return index_tts_service.download_models()
+# Speech backends run as blocking subprocesses; await them in a worker thread
+# so the event loop keeps serving other sessions.
+async def run_indextts_download() -> Tuple[str, str]:
+    return await asyncio.to_thread(index_tts_service.download_models)
 
 
-def run_indextts_load() -> Tuple[str, str]:
-    return index_tts_service.load_models()
+async def run_indextts_load() -> Tuple[str, str]:
+    return await asyncio.to_thread(index_tts_service.load_models)
 
 
-def run_indextts_synthesize(voice_file, text: str, steps: float) -> Tuple[str, str, Optional[str]]:
+async def run_indextts_synthesize(voice_file, text: str) -> Tuple[str, str, Optional[str]]:
     path = _coerce_file_path(voice_file)
-    summary, log, output = index_tts_service.synthesize(path, text, int(steps))
+    summary, log, output = await asyncio.to_thread(index_tts_service.synthesize, path, text)
     return summary, log, str(output) if output else None
 
 
-def run_vibevoice_setup() -> Tuple[str, str]:
-    return vibe_voice_service.setup()
+async def run_vibevoice_setup() -> Tuple[str, str]:
+    return await asyncio.to_thread(vibe_voice_service.setup)
 
 
-def run_vibevoice_synthesize(
+async def run_vibevoice_synthesize(
     text: str,
     voice_files,
     style: str,
@@ -322,11 +429,13 @@ def run_vibevoice_synthesize(
 ) -> Tuple[str, str, Optional[str]]:
     voices = _coerce_file_paths(voice_files)
     temp = float(temperature) if temperature is not None else None
-    summary, log, output = vibe_voice_service.synthesize(text, voices, style or None, temp, model_id or None)
+    summary, log, output = await asyncio.to_thread(
+        vibe_voice_service.synthesize, text, voices, style or None, temp, model_id or None
+    )
     return summary, log, str(output) if output else None
 
 
-def run_qwen_tts_synthesize(
+async def run_qwen_tts_synthesize(
     voice_file,
     reference_text: str,
     language: str,
@@ -336,7 +445,8 @@ def run_qwen_tts_synthesize(
     gap_ms: float,
 ) -> Tuple[str, str, Optional[str]]:
     voice = _coerce_file_path(voice_file)
-    summary, log, output = qwen_tts_service.synthesize(
+    summary, log, output = await asyncio.to_thread(
+        qwen_tts_service.synthesize,
         voice,
         reference_text,
         language,
@@ -349,6 +459,8 @@ def run_qwen_tts_synthesize(
 
 
 def create_app() -> gr.Blocks:
+    # Read per build, not at import: the token can be changed at runtime via set_api_token.
+    hf_token = os.getenv("HUGGINGFACE_API_TOKEN", "")
     with gr.Blocks(title="VoiceForge Gradio") as demo:
         gr.Markdown(
             """
@@ -363,10 +475,10 @@ def create_app() -> gr.Blocks:
         with gr.Accordion("HuggingFace API", open=False):
             token_box = gr.Textbox(
                 label="HuggingFace API Token",
-                value=os.getenv("HUGGINGFACE_API_TOKEN", ""),
+                value=hf_token,
                 type="password",
             )
-            token_status = gr.Markdown("Token status: configured" if os.getenv("HUGGINGFACE_API_TOKEN") else "Token status: missing")
+            token_status = gr.Markdown("Token status: configured" if hf_token else "Token status: missing")
             token_button = gr.Button("Apply Token")
             token_button.click(configure_token, inputs=[token_box], outputs=[token_status])
 
@@ -393,19 +505,19 @@ def create_app() -> gr.Blocks:
         gr.Markdown("## Speaker Configuration")
         with gr.Row():
             speaker_mode = gr.Dropdown(
-                choices=[m.value for m in SpeakerMode],
+                choices=_SPEAKER_MODE_CHOICES,
                 value=SpeakerMode.NONE.value,
                 label="Mode",
             )
             label_format = gr.Dropdown(
-                choices=[f.value for f in LabelFormat],
+                choices=_LABEL_FORMAT_CHOICES,
                 value=LabelFormat.SPEAKER.value,
                 label="Label Format",
             )
             speaker_count = gr.Slider(1, 10, value=2, step=1, label="Speaker Count")
             include_narrator = gr.Checkbox(False, label="Include Narrator")
             narrator_attribution = gr.Dropdown(
-                choices=[n.value for n in NarratorAttribution],
+                choices=_NARRATOR_ATTRIBUTION_CHOICES,
                 value=NarratorAttribution.REMOVE.value,
                 label="Narrator Attribution",
             )
@@ -421,7 +533,7 @@ def create_app() -> gr.Blocks:
         with gr.Row():
             batch_size = gr.Slider(1, 20, value=10, step=1, label="Batch size (sentences per chunk)")
             model_source = gr.Dropdown(
-                choices=[source.value for source in ModelSource],
+                choices=_MODEL_SOURCE_CHOICES,
                 value=ModelSource.API.value,
                 label="Model Source",
             )
@@ -431,7 +543,7 @@ def create_app() -> gr.Blocks:
                 visible=True,
             )
             ollama_model_name = gr.Textbox(
-                value=os.getenv("OLLAMA_MODEL", "llama3.1:8b"),
+                value=DEFAULT_OLLAMA_MODEL,
                 label="Ollama Model",
                 placeholder="e.g. llama3.1:8b",
                 visible=False,
@@ -442,6 +554,10 @@ def create_app() -> gr.Blocks:
         with gr.Row():
             single_pass = gr.Checkbox(False, label="Single-pass speaker formatting")
             extended_examples = gr.Checkbox(False, label="Extended examples")
+            parallelism = gr.Slider(1, 8, value=4, step=1, label="Parallel LLM requests")
+            max_chunk_tokens = gr.Slider(
+                0, 1500, value=0, step=50, label="Max tokens per chunk (0 = use batch size)"
+            )
 
         gr.Markdown("## Run")
         with gr.Row():
@@ -465,6 +581,7 @@ def create_app() -> gr.Blocks:
                 fix_hyphenation,
             ],
             outputs=[output_text, summary_box, log_box],
+            concurrency_limit=TEXT_CONCURRENCY_LIMIT,
         )
 
         process_button.click(
@@ -487,6 +604,8 @@ def create_app() -> gr.Blocks:
                 custom_instructions,
                 single_pass,
                 extended_examples,
+                parallelism,
+                max_chunk_tokens,
                 speaker_mode,
                 speaker_count,
                 label_format,
@@ -497,6 +616,7 @@ def create_app() -> gr.Blocks:
                 mapping_text,
             ],
             outputs=[output_text, summary_box, log_box],
+            concurrency_limit=TEXT_CONCURRENCY_LIMIT,
         )
 
         model_source.change(
@@ -518,7 +638,6 @@ def create_app() -> gr.Blocks:
                     indextts_load = gr.Button("Load Models")
                 indextts_voice = gr.File(label="Voice Prompt", file_types=[".wav", ".mp3", ".flac", ".ogg"])
                 indextts_text = gr.Textbox(label="Synthesis Text", lines=6)
-                indextts_steps = gr.Slider(5, 50, value=25, step=1, label="Diffusion Steps")
                 indextts_synthesize = gr.Button("Run IndexTTS Synthesis", variant="primary")
                 indextts_status = gr.Textbox(label="IndexTTS Status", lines=2)
                 indextts_logs = gr.Textbox(label="IndexTTS Logs", lines=6)
@@ -528,16 +647,22 @@ def create_app() -> gr.Blocks:
                     run_indextts_download,
                     inputs=None,
                     outputs=[indextts_status, indextts_logs],
+                    concurrency_limit=1,
+                    concurrency_id=SPEECH_CONCURRENCY_ID,
                 )
                 indextts_load.click(
                     run_indextts_load,
                     inputs=None,
                     outputs=[indextts_status, indextts_logs],
+                    concurrency_limit=1,
+                    concurrency_id=SPEECH_CONCURRENCY_ID,
                 )
                 indextts_synthesize.click(
                     run_indextts_synthesize,
-                    inputs=[indextts_voice, indextts_text, indextts_steps],
+                    inputs=[indextts_voice, indextts_text],
                     outputs=[indextts_status, indextts_logs, indextts_audio],
+                    concurrency_limit=1,
+                    concurrency_id=SPEECH_CONCURRENCY_ID,
                 )
 
             with gr.Tab("VibeVoice"):
@@ -562,11 +687,15 @@ def create_app() -> gr.Blocks:
                     run_vibevoice_setup,
                     inputs=None,
                     outputs=[vibe_status, vibe_logs],
+                    concurrency_limit=1,
+                    concurrency_id=SPEECH_CONCURRENCY_ID,
                 )
                 vibe_synthesize.click(
                     run_vibevoice_synthesize,
                     inputs=[vibe_text, vibe_voice_files, vibe_style, vibe_temperature, vibe_model],
                     outputs=[vibe_status, vibe_logs, vibe_audio],
+                    concurrency_limit=1,
+                    concurrency_id=SPEECH_CONCURRENCY_ID,
                 )
 
             with gr.Tab("Qwen3 TTS (Voice Clone)"):
@@ -584,7 +713,7 @@ def create_app() -> gr.Blocks:
                             "Qwen/Qwen3-TTS-12Hz-0.6B-Base",
                             "Qwen/Qwen3-TTS-12Hz-1.7B-Base",
                         ],
-                        value=os.getenv("QWEN_TTS_MODEL_ID", "Qwen/Qwen3-TTS-12Hz-0.6B-Base"),
+                        value=DEFAULT_QWEN_TTS_MODEL_ID,
                     )
                     qwen_language = gr.Dropdown(
                         label="Language",
@@ -601,7 +730,7 @@ def create_app() -> gr.Blocks:
                             "Spanish",
                             "Italian",
                         ],
-                        value=os.getenv("QWEN_TTS_LANGUAGE", "Auto"),
+                        value=DEFAULT_QWEN_TTS_LANGUAGE,
                     )
                     qwen_max_chars = gr.Slider(120, 800, value=320, step=10, label="Max chars per clip")
                     qwen_gap_ms = gr.Slider(0, 500, value=120, step=10, label="Gap between clips (ms)")
@@ -622,6 +751,11 @@ def create_app() -> gr.Blocks:
                         qwen_gap_ms,
                     ],
                     outputs=[qwen_status, qwen_logs, qwen_audio],
+                    concurrency_limit=1,
+                    concurrency_id=SPEECH_CONCURRENCY_ID,
                 )
 
+    # Speech handlers share a single slot, so one job runs at a time across all
+    # backends; text handlers run concurrently. Both wait in a bounded queue.
+    demo.queue(max_size=QUEUE_MAX_SIZE)
     return demo
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import codecs
+import hashlib
+import os
+import posixpath
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, TypeVar
+from urllib.parse import unquote
+
+from .storage import cache_dir, evict_oldest, write_text_atomic
+
+CONTAINER_PATH = "META-INF/container.xml"
+CONTAINER_NS = "{urn:oasis:names:tc:opendocument:xmlns:container}"
+OPF_NS = "{http://www.idpf.org/2007/opf}"
+DOCUMENT_MEDIA_TYPES = frozenset({"application/xhtml+xml", "text/html"})
+NON_TEXT_TAGS = ("script", "style", "noscript")
+
+# lxml drops the GIL while parsing and zlib while inflating, so documents
+# extract in parallel; the DOM walk itself still runs under the GIL.
+EXTRACT_WORKERS = min(8, os.cpu_count() or 1)
+
+CACHE_NAME = "epub"
+CACHE_MAX_BYTES = 500 * 1024 * 1024
+# Bump whenever extraction changes so stale text is not served from the cache.
+CACHE_VERSION = b"3"
+
+_T = TypeVar("_T")
+
+# Parsers are imported on first use so the UI starts without them.
+_epub = None
+_lxml_html = None
+_lxml_etree = None
+# lxml parsers are reusable but not thread-safe; keep one per thread and encoding.
+_parsers = threading.local()
+
+
+def _load_lxml():
+    global _lxml_html, _lxml_etree
+    if _lxml_html is None or _lxml_etree is None:
+        try:
+            from lxml import etree, html as lxml_html  # type: ignore
+        except ImportError as exc:
+            raise RuntimeError("lxml is required for EPUB processing") from exc
+        _lxml_html, _lxml_etree = lxml_html, etree
+    return _lxml_html, _lxml_etree
+
+
+def _load_ebooklib():
+    global _epub
+    if _epub is None:
+        try:
+            from ebooklib import epub  # type: ignore
+        except ImportError as exc:
+            raise RuntimeError("ebooklib is required for EPUB processing") from exc
+        _epub = epub
+    return _epub
+
+
+def _sniff_encoding(content: bytes) -> str:
+    # EPUB content documents must be UTF-8 or UTF-16; only the latter needs a BOM.
+    if content.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    return "utf-8"
+
+
+def _html_parser(encoding: str):
+    cache = getattr(_parsers, "by_encoding", None)
+    if cache is None:
+        cache = _parsers.by_encoding = {}
+    parser = cache.get(encoding)
+    if parser is None:
+        lxml_html, _ = _load_lxml()
+        parser = cache[encoding] = lxml_html.HTMLParser(
+            encoding=encoding, remove_comments=True, remove_pis=True
+        )
+    return parser
+
+
+def _document_text(content: bytes) -> str:
+    if not content or content.isspace():
+        return ""
+    lxml_html, _ = _load_lxml()
+    parser = _html_parser(_sniff_encoding(content))
+    root = lxml_html.fromstring(content, parser=parser)
+    body = root.find(".//body")
+    if body is None:
+        body = root
+    # Inline CSS and scripts are not prose. Emptying them in place, rather than
+    # stripping them, keeps their tail as a separate text node.
+    for element in list(body.iter(*NON_TEXT_TAGS)):
+        element.clear(keep_tail=True)
+    return _join_text_nodes(body.itertext())
+
+
+def _join_text_nodes(nodes: Iterable[str]) -> str:
+    # Whitespace-only nodes are markup indentation; keep only the line break
+    # they carry so block elements still land on separate lines.
+    lines: List[str] = []
+    words: List[str] = []
+    for node in nodes:
+        if not node.isspace():
+            words.append(node)
+        elif "\n" in node and words:
+            lines.append(" ".join(words))
+            words = []
+    if words:
+        lines.append(" ".join(words))
+    return "\n".join(lines)
+
+
+def _join_documents(extract: Callable[[_T], str], items: Iterable[_T]) -> str:
+    items = list(items)
+    if EXTRACT_WORKERS > 1 and len(items) > 1:
+        with ThreadPoolExecutor(
+            max_workers=min(EXTRACT_WORKERS, len(items)), thread_name_prefix="voiceforge-epub"
+        ) as executor:
+            texts = list(executor.map(extract, items))
+    else:
+        texts = [extract(item) for item in items]
+    return "\n".join(text for text in texts if text)
+
+
+def _spine_members(archive: zipfile.ZipFile) -> List[str]:
+    _, etree = _load_lxml()
+    container = etree.fromstring(archive.read(CONTAINER_PATH))
+    rootfile = container.find(f".//{CONTAINER_NS}rootfile")
+    package_path = rootfile.get("full-path") if rootfile is not None else None
+    if not package_path:
+        raise ValueError("EPUB container does not reference a package document")
+    package = etree.fromstring(archive.read(package_path))
+    documents = {
+        item.get("id"): item.get("href")
+        for item in package.iterfind(f"{OPF_NS}manifest/{OPF_NS}item")
+        if item.get("media-type") in DOCUMENT_MEDIA_TYPES and item.get("href")
+    }
+    base_dir = posixpath.dirname(package_path)
+    members: List[str] = []
+    for itemref in package.iterfind(f"{OPF_NS}spine/{OPF_NS}itemref"):
+        href = documents.get(itemref.get("idref"))
+        if href:
+            members.append(posixpath.normpath(posixpath.join(base_dir, unquote(href))))
+    return members
+
+
+def _read_with_ebooklib(path: Path) -> str:
+    epub = _load_ebooklib()
+    book = epub.read_epub(str(path))
+    documents = []
+    for idref, _linear in book.spine:
+        item = book.get_item_with_id(idref)
+        if item is not None and item.get_type() == epub.ITEM_DOCUMENT:
+            documents.append(item)
+    if not documents:
+        documents = list(book.get_items_of_type(epub.ITEM_DOCUMENT))
+    return _join_documents(lambda item: _document_text(item.get_body_content()), documents)
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.blake2b(CACHE_VERSION, digest_size=16)
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_cached(entry: Path) -> Optional[str]:
+    try:
+        text = entry.read_text(encoding="utf-8")
+    except OSError:
+        return None
+    # Refresh the timestamps eviction goes by; atime alone is unreliable on noatime mounts.
+    try:
+        os.utime(entry)
+    except OSError:
+        pass
+    return text
+
+
+def _write_cached(entry: Path, text: str) -> None:
+    try:
+        write_text_atomic(entry, text)
+        evict_oldest(entry.parent, "*.txt", CACHE_MAX_BYTES)
+    except OSError:
+        pass
+
+
+def read_epub_text(path: Path) -> str:
+    """Return the plain text of an EPUB's spine documents, in reading order.
+
+    Results are cached in the user's private cache_dir, keyed by a hash of
+    the file's contents, so reloading the same book skips parsing entirely.
+    """
+    directory = cache_dir(CACHE_NAME)
+    if directory is None:
+        return _extract_epub_text(path)
+    entry = directory / f"{_file_digest(path)}.txt"
+    cached = _read_cached(entry)
+    if cached is not None:
+        return cached
+    text = _extract_epub_text(path)
+    _write_cached(entry, text)
+    return text
+
+
+def _extract_epub_text(path: Path) -> str:
+    # The archive is read directly: container.xml points at the package
+    # document, whose spine lists the XHTML members to extract. ebooklib is
+    # only used when that metadata is missing or malformed.
+    _, etree = _load_lxml()
+    try:
+        with zipfile.ZipFile(path) as archive:
+            members = _spine_members(archive)
+            if members:
+                # ZipFile serialises reads of the shared handle; inflating runs in parallel.
+                return _join_documents(
+                    lambda member: _document_text(archive.read(member)), members
+                )
+    except (KeyError, ValueError, zipfile.BadZipFile, etree.XMLSyntaxError):
+        pass
+    return _read_with_ebooklib(path)
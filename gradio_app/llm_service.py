@@ -1,14 +1,22 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import os
+import random
+import threading
 import time
+from collections import OrderedDict, deque
 from dataclasses import dataclass
-from typing import Dict, Optional, Tuple
+from functools import lru_cache
+from typing import Deque, Dict, Optional, Set, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from huggingface_hub import InferenceClient, hf_hub_download
 
-from huggingface_hub import InferenceClient
 
 from .models import (
     CleaningOptions,
@@ -19,10 +27,293 @@ from .models import (
     SpeakerConfig,
     SpeakerMode,
 )
+from .storage import cache_dir, evict_oldest, json_loads, write_atomic
 from .text_cleaner import apply_deterministic_cleaning
 
 LOGGER = logging.getLogger(__name__)
 
+# Upper bound on provider requests in flight across every Gradio session.
+MAX_INFLIGHT_REQUESTS = max(1, int(os.getenv("VOICEFORGE_LLM_MAX_INFLIGHT", "4")))
+
+# Completed generations are reused for identical prompts (re-runs of the same
+# book, repeated boilerplate chunks). Sampling at higher temperatures is meant
+# to vary, so those responses are never cached.
+# Transient provider failures (timeouts, dropped connections, 429/5xx) are
+# retried with capped exponential backoff before the chunk is given up on.
+HF_REQUEST_TIMEOUT = float(os.getenv("VOICEFORGE_LLM_TIMEOUT", "120"))
+OLLAMA_REQUEST_TIMEOUT = 600
+MAX_GENERATION_ATTEMPTS = 3
+MAX_BACKOFF_SECONDS = 30.0
+# Optional provider-wide tokens-per-minute budget; 0 disables it.
+TOKENS_PER_MINUTE_LIMIT = max(0, int(os.getenv("VOICEFORGE_LLM_TPM_LIMIT", "0")))
+
+RESPONSE_CACHE_SIZE = 1000
+RESPONSE_CACHE_TTL = 24 * 60 * 60
+RESPONSE_CACHE_MAX_TEMPERATURE = 0.3
+# Responses are also kept on disk, in the user's private cache_dir, so re-running
+# a book after a restart skips the provider; the directory is trimmed every RESPONSE_CACHE_EVICT_INTERVAL writes.
+RESPONSE_CACHE_NAME = "llm"
+RESPONSE_CACHE_MAX_BYTES = 200 * 1024 * 1024
+RESPONSE_CACHE_EVICT_INTERVAL = 100
+
+
+@lru_cache(maxsize=32)
+def _cleaning_prompt_prefix(options: CleaningOptions, custom_instructions: Optional[str]) -> str:
+    # Everything before the chunk text depends only on the options, so it is
+    # built once per configuration and stays byte-identical across chunks,
+    # which also lets Ollama reuse its cached prompt prefix.
+    tasks = []
+    if options.replace_smart_quotes:
+        tasks.append("* Replace smart quotes with standard ASCII quotes.")
+    if options.fix_ocr_errors:
+        tasks.append("* Fix OCR errors such as merged words or missing spaces.")
+    if options.fix_hyphenation:
+        tasks.append("* Repair hyphenation splits introduced by line breaks.")
+    if options.correct_spelling:
+        tasks.append("* Correct obvious spelling mistakes and typos.")
+    if options.remove_urls:
+        tasks.append("* Remove URLs, web links, and email addresses.")
+    if options.remove_footnotes:
+        tasks.append("* Remove footnote markers, metadata, or bracketed references.")
+    if options.add_punctuation:
+        tasks.append("* Ensure stray headings or numbers end with appropriate punctuation.")
+
+    prompt = (
+        "You are a TTS preprocessing assistant. Clean and repair the text using ONLY the listed transformations.\n\n"
+        "Preprocessing Steps:\n"
+        + "\n".join(tasks)
+        + "\n\nRules:\n"
+        "- Preserve the original meaning and paragraph structure.\n"
+        "- Only fix errors; do not rewrite or summarize.\n"
+        "- Return ONLY the cleaned text with no commentary.\n"
+    )
+
+    if custom_instructions:
+        prompt += f"\nAdditional custom instructions:\n{custom_instructions.strip()}\n"
+    return prompt
+
+
+@lru_cache(maxsize=32)
+def _speaker_prompt_prefix(
+    mode: SpeakerMode,
+    label_format: LabelFormat,
+    include_narrator: bool,
+    narrator_attribution: NarratorAttribution,
+    narrator_character_name: Optional[str],
+    example_names: Optional[Tuple[str, ...]],
+    custom_instructions: Optional[str],
+) -> str:
+    # Keyed on the speaker settings that shape the prompt rather than on the
+    # whole SpeakerConfig, so fields such as sample_size do not split the cache.
+    label_example = "[1]:" if label_format == LabelFormat.BRACKET else "Speaker 1:"
+    if label_format == LabelFormat.BRACKET:
+        instructions = (
+            "Identify unique speaking characters. Label them dynamically using bracket format:"
+            " the first character is [1]:, the next is [2]:, etc."
+        )
+    else:
+        instructions = (
+            "Identify unique speaking characters. Label them dynamically as Speaker 1:, Speaker 2:, etc."
+        )
+
+    if include_narrator:
+        narrator_rule = (
+            "All non-quoted narration must use the Narrator: tag; never attribute narration to speakers."
+        )
+    else:
+        narrator_rule = "Omit narration; output only spoken dialogue with speaker labels."
+
+    narrator_identity = ""
+    if narrator_character_name:
+        narrator_identity = (
+            "Narrator Identity: The narrator is "
+            f"\"{narrator_character_name}\"."
+        )
+
+    if mode == SpeakerMode.FORMAT:
+        attribution_rule = (
+            "Do not transform attribution tags. Preserve text and punctuation; only add speaker labels."
+        )
+    else:
+        if narrator_attribution == NarratorAttribution.REMOVE:
+            attribution_rule = (
+                "Remove redundant attribution tags (e.g., he said) because the speaker label replaces them."
+            )
+        elif narrator_attribution == NarratorAttribution.VERBATIM:
+            attribution_rule = (
+                "Move attribution tags into a Narrator: line immediately after the spoken line, preserving punctuation."
+            )
+        else:
+            attribution_rule = (
+                "Transform attribution or action tags into concise Narrator: lines, omitting redundant verbs."
+            )
+
+    examples = ""
+    if example_names is not None:
+        names = example_names or ("Alice", "Bob", "Charlie")
+        speaker_two = "[2]:" if label_format == LabelFormat.BRACKET else "Speaker 2:"
+        examples = (
+            "Examples:\n"
+            f"Input: \"Are you coming to the party?\" {names[0]} asked.\n"
+            f"Output: {label_example} Are you coming to the party?\n"
+            f"Input: \"It's a beautiful day,\" {names[1] if len(names) > 1 else 'Bob'} said, looking up.\n"
+            f"Output: {speaker_two} It's a beautiful day.\n"
+        )
+        if include_narrator:
+            examples += "Narrator: They looked up at the sky.\n"
+
+    prompt_parts = [
+        "You are a dialogue structuring assistant for multi-speaker TTS.",
+        instructions,
+        narrator_rule,
+        "Remove quotation marks from dialogue.",
+        attribution_rule,
+    ]
+
+    if narrator_identity:
+        prompt_parts.append(narrator_identity)
+    if custom_instructions:
+        prompt_parts.append(f"Additional instructions: {custom_instructions.strip()}")
+    if examples:
+        prompt_parts.append(examples.strip())
+    return "\n".join(prompt_parts)
+
+
+@lru_cache(maxsize=32)
+def _single_pass_preprocessing(options: CleaningOptions, llm_cleaning_disabled: bool) -> str:
+    # Mirrors buildSinglePassPrompt in server/llm-service.ts: the cleaning
+    # tasks ride along with the speaker rules so one request does both passes.
+    if llm_cleaning_disabled:
+        return (
+            "Enabled preprocessing transformations:\n"
+            "- Do not perform additional LLM cleaning; deterministic cleanup has already been applied."
+        )
+    parts = []
+    if options.replace_smart_quotes:
+        parts.append("- Replace smart quotes with ASCII (\" and ').")
+    if options.fix_ocr_errors:
+        parts.append("- Fix OCR spacing issues and merged words.")
+    if options.fix_hyphenation:
+        parts.append("- Fix words split across line breaks by hyphenation artifacts.")
+    if options.correct_spelling:
+        parts.append("- Correct common spelling mistakes and typos.")
+    if options.remove_urls:
+        parts.append("- Remove URLs, links, and email addresses.")
+    if options.remove_footnotes:
+        parts.append("- Remove footnote markers and extraneous metadata.")
+    if options.add_punctuation:
+        parts.append("- Add terminal punctuation to standalone structural headings for TTS prosody.")
+    if not parts:
+        return "Enabled preprocessing transformations:\n- None. Do not clean or rewrite the source text."
+    return "\n".join(["Enabled preprocessing transformations:", *parts])
+
+
+class ProviderHTTPError(RuntimeError):
+    def __init__(self, message: str, status_code: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _is_transient(exc: BaseException) -> bool:
+    # Connection failures are re-raised as RuntimeError from the requests error.
+    cause = exc.__cause__ if exc.__cause__ is not None else exc
+    if isinstance(cause, (requests.Timeout, requests.ConnectionError, TimeoutError)):
+        return True
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status is not None and (status == 429 or status >= 500)
+
+
+class _TokenBudget:
+    """Sliding one-minute window of provider tokens shared by all sessions."""
+
+    def __init__(self, limit: int) -> None:
+        self._limit = limit
+        self._window: Deque[Tuple[float, int]] = deque()
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float) -> None:
+        while self._window and now - self._window[0][0] >= 60:
+            self._used -= self._window.popleft()[1]
+
+    def acquire(self, tokens: int) -> None:
+        if not self._limit:
+            return
+        # A single prompt larger than the budget is admitted on an empty window.
+        tokens = min(tokens, self._limit)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._expire(now)
+                if self._used + tokens <= self._limit:
+                    self._append(now, tokens)
+                    return
+                wait = 60 - (now - self._window[0][0])
+            time.sleep(max(wait, 0.05))
+
+    def record(self, tokens: int) -> None:
+        if not self._limit or tokens <= 0:
+            return
+        with self._lock:
+            self._append(time.monotonic(), tokens)
+
+    def _append(self, now: float, tokens: int) -> None:
+        self._window.append((now, tokens))
+        self._used += tokens
+
+
+def _canonical_prompt(prompt: str) -> str:
+    # Trailing spaces and CRLF/CR line endings do not change what the model is
+    # asked to do, so they should not split the response cache.
+    return "\n".join(line.rstrip() for line in prompt.strip().splitlines())
+
+
+def _read_disk_response(key: str) -> Optional[Tuple[float, str, Dict[str, float]]]:
+    directory = cache_dir(RESPONSE_CACHE_NAME)
+    if directory is None:
+        return None
+    try:
+        entry = directory / f"{key}.json"
+        age = time.time() - entry.stat().st_mtime
+        if age > RESPONSE_CACHE_TTL:
+            return None
+        data = json_loads(entry.read_bytes())
+        # Stamped on the monotonic clock the in-memory cache expires by.
+        return time.monotonic() - age, data["text"], data["usage"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_disk_response(key: str, text: str, usage: Dict[str, float]) -> None:
+    directory = cache_dir(RESPONSE_CACHE_NAME)
+    if directory is None:
+        return
+    try:
+        write_atomic(
+            directory / f"{key}.json",
+            lambda handle: json.dump({"text": text, "usage": usage}, handle),
+        )
+    except OSError:
+        pass
+
+
+def _evict_disk_responses() -> None:
+    directory = cache_dir(RESPONSE_CACHE_NAME)
+    if directory is None:
+        return
+    # Like the write, trimming is best effort; it must never cost a paid-for response.
+    try:
+        evict_oldest(
+            directory,
+            "*.json",
+            RESPONSE_CACHE_MAX_BYTES,
+            expired_before=time.time() - RESPONSE_CACHE_TTL,
+        )
+    except OSError:
+        pass
+
 
 def estimate_tokens(text: str) -> int:
     if not text:
@@ -31,7 +322,41 @@ def estimate_tokens(text: str) -> int:
     return max(1, len(text.strip()) // 4)
 
 
-@dataclass
+_tokenizer_locks: Dict[Tuple[str, Optional[str]], threading.Lock] = {}
+
+
+def _hf_tokenizer(model_name: str, token: Optional[str]):
+    # The first call may download tokenizer.json; parallel chunks for the same
+    # model wait for that one download, while other models carry on.
+    key = (model_name, token)
+    # setdefault is atomic, so racing first calls still end up sharing one lock.
+    lock = _tokenizer_locks.get(key) or _tokenizer_locks.setdefault(key, threading.Lock())
+    with lock:
+        return _load_hf_tokenizer(model_name, token)
+
+
+@lru_cache(maxsize=4)
+def _load_hf_tokenizer(model_name: str, token: Optional[str]):
+    # Exact counts need the optional `tokenizers` package and a downloadable
+    # tokenizer.json; without either, usage falls back to estimate_tokens.
+    try:
+        from tokenizers import Tokenizer  # type: ignore
+    except ImportError:
+        return None
+    try:
+        return Tokenizer.from_file(hf_hub_download(model_name, "tokenizer.json", token=token))
+    except Exception as exc:  # noqa: BLE001 - any failure means "estimate instead"
+        LOGGER.info("No tokenizer for %s (%s); estimating token counts", model_name, exc)
+        return None
+
+
+def _count_tokens(text: str, tokenizer) -> int:
+    if tokenizer is None or not text:
+        return estimate_tokens(text)
+    return len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+
+@dataclass(frozen=True, slots=True)
 class ProcessOptions:
     text: str
     cleaning_options: CleaningOptions
@@ -52,6 +377,23 @@ class LLMService:
     def __init__(self) -> None:
         self._client: Optional[InferenceClient] = None
         self._token: Optional[str] = None
+        # Reused across chunks so Ollama requests keep their connection alive.
+        self._http = requests.Session()
+        # One pooled connection per in-flight request. Failed requests are
+        # retried by _generate_with_retries only, so attempts never multiply.
+        adapter = HTTPAdapter(pool_maxsize=MAX_INFLIGHT_REQUESTS)
+        self._http.mount("http://", adapter)
+        self._http.mount("https://", adapter)
+        self._inflight = threading.BoundedSemaphore(MAX_INFLIGHT_REQUESTS)
+        self._budget = _TokenBudget(TOKENS_PER_MINUTE_LIMIT)
+        self._responses: OrderedDict[str, Tuple[float, str, Dict[str, float]]] = OrderedDict()
+        self._responses_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._disk_writes = 0
+        # (base_url, model) pairs whose /api/generate replies come back empty
+        # but /api/chat answers; later chunks skip the wasted generate call.
+        self._ollama_chat_only: Set[Tuple[str, str]] = set()
         self._update_client_from_env()
 
     # ------------------------------------------------------------------
@@ -65,7 +407,7 @@ class LLMService:
         )
         if token != self._token:
             self._token = token
-            self._client = InferenceClient(token=token) if token else None
+            self._client = InferenceClient(token=token, timeout=HF_REQUEST_TIMEOUT) if token else None
             LOGGER.info("Configured HuggingFace InferenceClient: %s", "yes" if token else "no token")
 
     def set_api_token(self, token: Optional[str]) -> None:
@@ -84,37 +426,8 @@ class LLMService:
         options: CleaningOptions,
         custom_instructions: Optional[str],
     ) -> str:
-        tasks = []
-        if options.replace_smart_quotes:
-            tasks.append("* Replace smart quotes with standard ASCII quotes.")
-        if options.fix_ocr_errors:
-            tasks.append("* Fix OCR errors such as merged words or missing spaces.")
-        if options.fix_hyphenation:
-            tasks.append("* Repair hyphenation splits introduced by line breaks.")
-        if options.correct_spelling:
-            tasks.append("* Correct obvious spelling mistakes and typos.")
-        if options.remove_urls:
-            tasks.append("* Remove URLs, web links, and email addresses.")
-        if options.remove_footnotes:
-            tasks.append("* Remove footnote markers, metadata, or bracketed references.")
-        if options.add_punctuation:
-            tasks.append("* Ensure stray headings or numbers end with appropriate punctuation.")
-
-        prompt = (
-            "You are a TTS preprocessing assistant. Clean and repair the text using ONLY the listed transformations.\n\n"
-            "Preprocessing Steps:\n"
-            + "\n".join(tasks)
-            + "\n\nRules:\n"
-            "- Preserve the original meaning and paragraph structure.\n"
-            "- Only fix errors; do not rewrite or summarize.\n"
-            "- Return ONLY the cleaned text with no commentary.\n"
-        )
-
-        if custom_instructions:
-            prompt += f"\nAdditional custom instructions:\n{custom_instructions.strip()}\n"
-
-        prompt += f"\nText:\n{text}\n\nCleaned:"
-        return prompt
+        prefix = _cleaning_prompt_prefix(options, custom_instructions)
+        return f"{prefix}\nText:\n{text}\n\nCleaned:"
 
     def _build_speaker_prompt(
         self,
@@ -123,80 +436,36 @@ class LLMService:
         custom_instructions: Optional[str],
         extended_examples: bool,
     ) -> str:
-        label_example = "[1]:" if config.label_format == LabelFormat.BRACKET else "Speaker 1:"
-        if config.label_format == LabelFormat.BRACKET:
-            instructions = (
-                "Identify unique speaking characters. Label them dynamically using bracket format:"
-                " the first character is [1]:, the next is [2]:, etc."
-            )
-        else:
-            instructions = (
-                "Identify unique speaking characters. Label them dynamically as Speaker 1:, Speaker 2:, etc."
-            )
-
-        if config.include_narrator:
-            narrator_rule = (
-                "All non-quoted narration must use the Narrator: tag; never attribute narration to speakers."
-            )
-        else:
-            narrator_rule = "Omit narration; output only spoken dialogue with speaker labels."
+        prefix = self._speaker_prefix(config, custom_instructions, extended_examples)
+        return f"{prefix}\n\nText:\n{text}\n\nFormatted:"
 
-        narrator_identity = ""
-        if config.narrator_character_name:
-            narrator_identity = (
-                "Narrator Identity: The narrator is "
-                f"\"{config.narrator_character_name}\"."
-            )
-
-        if config.mode == SpeakerMode.FORMAT:
-            attribution_rule = (
-                "Do not transform attribution tags. Preserve text and punctuation; only add speaker labels."
-            )
-        else:
-            if config.narrator_attribution == NarratorAttribution.REMOVE:
-                attribution_rule = (
-                    "Remove redundant attribution tags (e.g., he said) because the speaker label replaces them."
-                )
-            elif config.narrator_attribution == NarratorAttribution.VERBATIM:
-                attribution_rule = (
-                    "Move attribution tags into a Narrator: line immediately after the spoken line, preserving punctuation."
-                )
-            else:
-                attribution_rule = (
-                    "Transform attribution or action tags into concise Narrator: lines, omitting redundant verbs."
-                )
+    def _build_single_pass_prompt(
+        self,
+        text: str,
+        cleaning: CleaningOptions,
+        config: SpeakerConfig,
+        custom_instructions: Optional[str],
+        extended_examples: bool,
+        llm_cleaning_disabled: bool,
+    ) -> str:
+        prefix = self._speaker_prefix(config, custom_instructions, extended_examples)
+        preprocessing = _single_pass_preprocessing(cleaning, llm_cleaning_disabled)
+        return f"{prefix}\n{preprocessing}\n\nText:\n{text}\n\nFormatted:"
 
-        examples = ""
+    @staticmethod
+    def _speaker_prefix(config: SpeakerConfig, custom_instructions: Optional[str], extended_examples: bool) -> str:
+        example_names = None
         if extended_examples and config.mode == SpeakerMode.INTELLIGENT:
-            names = [mapping.name for mapping in config.character_mapping] or ["Alice", "Bob", "Charlie"]
-            speaker_two = "[2]:" if config.label_format == LabelFormat.BRACKET else "Speaker 2:"
-            examples = (
-                "Examples:\n"
-                f"Input: \"Are you coming to the party?\" {names[0]} asked.\n"
-                f"Output: {label_example} Are you coming to the party?\n"
-                f"Input: \"It's a beautiful day,\" {names[1] if len(names) > 1 else 'Bob'} said, looking up.\n"
-                f"Output: {speaker_two} It's a beautiful day.\n"
-            )
-            if config.include_narrator:
-                examples += "Narrator: They looked up at the sky.\n"
-
-        prompt_parts = [
-            "You are a dialogue structuring assistant for multi-speaker TTS.",
-            instructions,
-            narrator_rule,
-            "Remove quotation marks from dialogue.",
-            attribution_rule,
-        ]
-
-        if narrator_identity:
-            prompt_parts.append(narrator_identity)
-        if custom_instructions:
-            prompt_parts.append(f"Additional instructions: {custom_instructions.strip()}")
-        if examples:
-            prompt_parts.append(examples.strip())
-
-        prompt_parts.append(f"\nText:\n{text}\n\nFormatted:")
-        return "\n".join(prompt_parts)
+            example_names = tuple(mapping.name for mapping in config.character_mapping)
+        return _speaker_prompt_prefix(
+            config.mode,
+            config.label_format,
+            config.include_narrator,
+            config.narrator_attribution,
+            config.narrator_character_name,
+            example_names,
+            custom_instructions,
+        )
 
     # ------------------------------------------------------------------
     # Core processing
@@ -216,11 +485,13 @@ class LLMService:
             applied_steps.extend(clean_result.applied)
 
         if options.speaker_config and options.speaker_config.is_enabled() and options.single_pass:
-            prompt = self._build_speaker_prompt(
+            prompt = self._build_single_pass_prompt(
                 text,
+                options.cleaning_options,
                 options.speaker_config,
                 options.custom_instructions,
                 options.extended_examples,
+                options.llm_cleaning_disabled,
             )
         else:
             prompt = self._build_cleaning_prompt(text, options.cleaning_options, options.custom_instructions)
@@ -269,11 +540,94 @@ class LLMService:
 
     # ------------------------------------------------------------------
     def _generate_text(self, prompt: str, options: ProcessOptions) -> Tuple[str, Dict[str, float]]:
-        if options.model_source == ModelSource.OLLAMA:
-            return self._generate_with_ollama(prompt, options)
-        return self._generate_with_hf(prompt, options.model_name, options.temperature)
+        cacheable = options.temperature is not None and options.temperature <= RESPONSE_CACHE_MAX_TEMPERATURE
+        key = self._response_key(prompt, options) if cacheable else None
+        if key is not None:
+            cached = self._cached_response(key)
+            if cached is not None:
+                return cached
+        text, usage = self._generate_with_retries(prompt, options)
+        # Empty output fails validation and is retried; never replay it.
+        if key is not None and text.strip():
+            self._store_response(key, text, usage)
+        return text, usage
 
-    def _generate_with_hf(self, prompt: str, model_name: str, temperature: float) -> Tuple[str, Dict[str, float]]:
+    def _generate_with_retries(self, prompt: str, options: ProcessOptions) -> Tuple[str, Dict[str, float]]:
+        # Resolved before taking an in-flight slot, as it may mean a download.
+        tokenizer = (
+            _hf_tokenizer(options.model_name, self._token) if options.model_source != ModelSource.OLLAMA else None
+        )
+        attempt = 0
+        while True:
+            self._budget.acquire(estimate_tokens(prompt))
+            try:
+                # All sessions share this service, so the semaphore acts as a
+                # single dispatch queue in front of the provider.
+                with self._inflight:
+                    if options.model_source == ModelSource.OLLAMA:
+                        text, usage = self._generate_with_ollama(prompt, options)
+                    else:
+                        text, usage = self._generate_with_hf(
+                            prompt, options.model_name, options.temperature, tokenizer
+                        )
+            except Exception as exc:  # noqa: BLE001 - classified below
+                attempt += 1
+                if attempt >= MAX_GENERATION_ATTEMPTS or not _is_transient(exc):
+                    raise
+                # Back off outside the semaphore so waiting never holds a slot.
+                delay = min(2 ** (attempt - 1), MAX_BACKOFF_SECONDS) + random.uniform(0, 1)
+                LOGGER.warning("Transient LLM failure (%s); retrying in %.1fs", exc, delay)
+                time.sleep(delay)
+                continue
+            self._budget.record(int(usage["output_tokens"]))
+            return text, usage
+
+    @staticmethod
+    def _response_key(prompt: str, options: ProcessOptions) -> str:
+        model = options.ollama_model_name if options.model_source == ModelSource.OLLAMA else options.model_name
+        header = f"{options.model_source.value}|{model}|{options.temperature:.3f}|"
+        return hashlib.sha256((header + _canonical_prompt(prompt)).encode("utf-8")).hexdigest()
+
+    def _cached_response(self, key: str) -> Optional[Tuple[str, Dict[str, float]]]:
+        with self._responses_lock:
+            entry = self._responses.get(key)
+            if entry is not None and time.monotonic() - entry[0] > RESPONSE_CACHE_TTL:
+                del self._responses[key]
+                entry = None
+            if entry is not None:
+                self._responses.move_to_end(key)
+                self.cache_hits += 1
+        if entry is None:
+            entry = _read_disk_response(key)
+            with self._responses_lock:
+                if entry is None:
+                    self.cache_misses += 1
+                    return None
+                self.cache_hits += 1
+                self._remember_response(key, entry)
+        # Nothing was sent to the provider, so a hit reports zero usage, the
+        # same as a chunk reused within one run; cache_hits counts them.
+        return entry[1], {"input_tokens": 0, "output_tokens": 0, "input_cost": 0.0, "output_cost": 0.0}
+
+    def _store_response(self, key: str, text: str, usage: Dict[str, float]) -> None:
+        with self._responses_lock:
+            self._remember_response(key, (time.monotonic(), text, dict(usage)))
+            self._disk_writes += 1
+            evict = self._disk_writes % RESPONSE_CACHE_EVICT_INTERVAL == 1
+        _write_disk_response(key, text, usage)
+        if evict:
+            _evict_disk_responses()
+
+    def _remember_response(self, key: str, entry: Tuple[float, str, Dict[str, float]]) -> None:
+        # Caller holds _responses_lock.
+        self._responses[key] = entry
+        self._responses.move_to_end(key)
+        while len(self._responses) > RESPONSE_CACHE_SIZE:
+            self._responses.popitem(last=False)
+
+    def _generate_with_hf(
+        self, prompt: str, model_name: str, temperature: float, tokenizer
+    ) -> Tuple[str, Dict[str, float]]:
         if not self._client:
             raise RuntimeError("HuggingFace client not configured")
         LOGGER.debug("Generating with HuggingFace model=%s temperature=%s", model_name, temperature)
@@ -291,8 +645,8 @@ class LLMService:
         LOGGER.debug("HuggingFace generation completed in %.2fs", duration)
         text = response.strip() if isinstance(response, str) else str(response)
         usage = {
-            "input_tokens": estimate_tokens(prompt),
-            "output_tokens": estimate_tokens(text),
+            "input_tokens": _count_tokens(prompt, tokenizer),
+            "output_tokens": _count_tokens(text, tokenizer),
             "input_cost": 0.0,
             "output_cost": 0.0,
         }
@@ -318,24 +672,29 @@ class LLMService:
             },
         }
         url = f"{base_url}/api/generate"
-        LOGGER.debug("Generating with Ollama model=%s at %s", model, url)
-        try:
-            response = requests.post(url, json=payload, timeout=600)
-        except requests.RequestException as exc:  # noqa: BLE001
-            raise RuntimeError(f"Failed to reach Ollama at {url}: {exc}") from exc
-        if not response.ok:
-            raise RuntimeError(f"Ollama request failed ({response.status_code}): {response.text}")
+        chat_only = (base_url, model) in self._ollama_chat_only
         text = ""
-        try:
-            data = response.json()
-        except ValueError as exc:  # noqa: BLE001
-            raise RuntimeError("Ollama response was not valid JSON") from exc
-        text = (
-            data.get("response")
-            or data.get("final_response")
-            or data.get("message", {}).get("content")
-            or ""
-        )
+        data: Dict = {}
+        if not chat_only:
+            LOGGER.debug("Generating with Ollama model=%s at %s", model, url)
+            try:
+                response = self._http.post(url, json=payload, timeout=OLLAMA_REQUEST_TIMEOUT)
+            except requests.RequestException as exc:  # noqa: BLE001
+                raise RuntimeError(f"Failed to reach Ollama at {url}: {exc}") from exc
+            if not response.ok:
+                raise ProviderHTTPError(
+                    f"Ollama request failed ({response.status_code}): {response.text}", response.status_code
+                )
+            try:
+                data = json_loads(response.content)
+            except ValueError as exc:  # noqa: BLE001
+                raise RuntimeError("Ollama response was not valid JSON") from exc
+            text = (
+                data.get("response")
+                or data.get("final_response")
+                or data.get("message", {}).get("content")
+                or ""
+            )
         if not text.strip():
             chat_payload = {
                 "model": model,
@@ -346,21 +705,28 @@ class LLMService:
             }
             chat_url = f"{base_url}/api/chat"
             try:
-                chat_response = requests.post(chat_url, json=chat_payload, timeout=600)
+                chat_response = self._http.post(chat_url, json=chat_payload, timeout=OLLAMA_REQUEST_TIMEOUT)
             except requests.RequestException as exc:  # noqa: BLE001
                 raise RuntimeError(f"Failed to reach Ollama chat endpoint at {chat_url}: {exc}") from exc
             if not chat_response.ok:
-                raise RuntimeError(
-                    f"Ollama chat request failed ({chat_response.status_code}): {chat_response.text}"
+                raise ProviderHTTPError(
+                    f"Ollama chat request failed ({chat_response.status_code}): {chat_response.text}",
+                    chat_response.status_code,
                 )
             try:
-                chat_data = chat_response.json()
+                chat_data = json_loads(chat_response.content)
             except ValueError as exc:  # noqa: BLE001
                 raise RuntimeError("Ollama chat response was not valid JSON") from exc
             text = chat_data.get("message", {}).get("content") or chat_data.get("response", "")
+            data = chat_data
+            if not chat_only and text.strip():
+                LOGGER.info("Ollama model %s answers only via /api/chat; using it for later requests", model)
+                self._ollama_chat_only.add((base_url, model))
+        # eval_count is exact, but prompt_eval_count leaves out prompt tokens
+        # served from Ollama's prefix cache, so the prompt is estimated instead.
         usage = {
             "input_tokens": estimate_tokens(prompt),
-            "output_tokens": estimate_tokens(text),
+            "output_tokens": data.get("eval_count") or estimate_tokens(text),
             "input_cost": 0.0,
             "output_cost": 0.0,
         }
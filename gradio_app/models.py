@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional
+from pathlib import Path
+from typing import List, Optional, Tuple
 
 
 class SpeakerMode(str, Enum):
@@ -27,7 +28,7 @@ class ModelSource(str, Enum):
     OLLAMA = "ollama"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CleaningOptions:
     replace_smart_quotes: bool = True
     fix_ocr_errors: bool = True
@@ -38,30 +39,31 @@ class CleaningOptions:
     fix_hyphenation: bool = False
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class CharacterMapping:
     name: str
     speaker_number: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SpeakerConfig:
     mode: SpeakerMode = SpeakerMode.NONE
     speaker_count: int = 2
     label_format: LabelFormat = LabelFormat.SPEAKER
-    speaker_mapping: Dict[str, str] = field(default_factory=dict)
+    # (label, name) pairs; tuples keep shared instances truly immutable.
+    speaker_mapping: Tuple[Tuple[str, str], ...] = ()
     extract_characters: bool = False
     sample_size: int = 50
     include_narrator: bool = False
     narrator_attribution: NarratorAttribution = NarratorAttribution.REMOVE
-    character_mapping: List[CharacterMapping] = field(default_factory=list)
+    character_mapping: Tuple[CharacterMapping, ...] = ()
     narrator_character_name: Optional[str] = None
 
     def is_enabled(self) -> bool:
         return self.mode != SpeakerMode.NONE
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingConfig:
     batch_size: int = 10
     cleaning_options: CleaningOptions = field(default_factory=CleaningOptions)
@@ -74,9 +76,16 @@ class ProcessingConfig:
     custom_instructions: Optional[str] = None
     single_pass: bool = False
     extended_examples: bool = False
+    parallelism: int = 1
+    # When positive, chunks are packed up to this many estimated tokens
+    # instead of batch_size sentences.
+    max_chunk_tokens: int = 0
+    # When set, processed chunks are written here as they finish instead of
+    # being kept in memory; summaries then carry text_path and an empty text.
+    output_path: Optional[Path] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProcessChunkResult:
     text: str
     input_tokens: int = 0
@@ -86,7 +95,7 @@ class ProcessChunkResult:
     applied_steps: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ProcessingProgress:
     chunk_index: int
     processed_text: str
@@ -104,7 +113,7 @@ class ProcessingProgress:
     total_cost: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingSummary:
     text: str
     total_chunks: int
@@ -113,3 +122,5 @@ class ProcessingSummary:
     total_cost: float
     applied_cleaning_steps: List[str]
     logs: List[str]
+    completed_chunks: int = 0
+    text_path: Optional[Path] = None
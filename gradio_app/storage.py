@@ -0,0 +1,71 @@
+"""File helpers shared by the on-disk caches and the speech job files."""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional, TextIO
+
+try:  # Installed alongside Gradio; the stdlib parser is the fallback.
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+
+def cache_dir(name: str) -> Optional[Path]:
+    """Return this user's private cache directory ``voiceforge/<name>``.
+
+    Cached text is trusted on read, so the directory lives under the user's
+    cache root rather than the shared temp dir, and is created with mode
+    0700. ``None`` means it cannot be used (another owner, or unwritable).
+    """
+    root = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "voiceforge"
+    directory = root / name
+    try:
+        for path in (root, directory):
+            path.mkdir(mode=0o700, parents=True, exist_ok=True)
+            if not hasattr(os, "getuid"):  # Windows: the profile dir is already private.
+                continue
+            stat = path.stat()
+            if stat.st_uid != os.getuid():
+                return None
+            if stat.st_mode & 0o077:
+                os.chmod(path, 0o700)
+    except OSError:
+        return None
+    return directory
+
+
+def write_atomic(path: Path, write: Callable[[TextIO], object]) -> None:
+    """Write ``path`` through ``write(handle)``; readers only ever see a complete file."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            write(handle)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    write_atomic(path, lambda handle: handle.write(text))
+
+
+def evict_oldest(directory: Path, pattern: str, max_bytes: int, expired_before: float = 0.0) -> None:
+    """Delete entries older than ``expired_before``, then the least recently
+    touched ones until the rest fit in ``max_bytes``."""
+    entries = []
+    for entry in directory.glob(pattern):
+        try:
+            entries.append((entry.stat(), entry))
+        except OSError:
+            continue
+    total = sum(stat.st_size for stat, _ in entries)
+    for stat, entry in sorted(entries, key=lambda pair: pair[0].st_mtime):
+        if total <= max_bytes and stat.st_mtime >= expired_before:
+            break
+        entry.unlink(missing_ok=True)
+        total -= stat.st_size
@@ -3,9 +3,11 @@ from __future__ import annotations
 import os
 import re
 from dataclasses import dataclass
-from typing import List, Sequence, Set
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 
 from .models import CleaningOptions
+from .storage import cache_dir, write_text_atomic
 
 
 SMART_REPLACEMENTS = {
@@ -31,15 +33,20 @@ SMART_REPLACEMENTS = {
     "·": "-",
 }
 
-SMART_PUNCTUATION_RE = re.compile(r"[“”„«»‹›‘’‚‛–—−‐‑‒…•·]")
-NBSP_RE = re.compile(r"\u00a0")
+# (char, replacement) pairs for a chain of str.replace calls: each is a C-level
+# scan that is skipped when the character is absent, which beats one regex pass
+# with a Python callback per match.
+_PUNCTUATION_REPLACEMENTS = (*SMART_REPLACEMENTS.items(), ("\u00a0", " "))
 URL_RE = re.compile(r"\b(?:https?://|www\.)[^\s<>()]+", re.IGNORECASE)
+WWW_RE = re.compile(r"www\.", re.IGNORECASE)
 BRACKET_REFERENCE_RE = re.compile(
     r"\[\s*(?:[0-9]+|[ivxlcdmIVXLCDM]+)(?:[\s,.;:-]*(?:[0-9]+|[ivxlcdmIVXLCDM]+))*\s*\]"
 )
 PAREN_FOOTNOTE_RE = re.compile(
     r"\(\s*(?:[0-9]+|[ivxlcdmIVXLCDM]+)(?:[\s,.;:-]*(?:[0-9]+|[ivxlcdmIVXLCDM]+))*\s*\)"
 )
+HYPHEN_BREAK_RE = re.compile(r"(?<=[A-Za-z])-\s*\n\s*(?=[A-Za-z])")
+SOFT_LINE_BREAK_RE = re.compile(r"(?<=[A-Za-z])\n(?=[A-Za-z])")
 CAMEL_CASE_SPLIT_RE = re.compile(r"([a-z])([A-Z][a-z]+)")
 MERGED_WORD_RE = re.compile(r"\b[a-zA-Z]{6,}\b")
 MULTI_SPACE_RE = re.compile(r"[ \t]{2,}")
@@ -310,6 +317,12 @@ DICT_CANDIDATE_PATHS: Sequence[str] = (
 )
 
 MAX_LEXICON_SIZE = 60_000
+# Every cleaning worker process loads the lexicon; reading back a prebuilt
+# word list is several times faster than re-filtering the system dictionary.
+# It is trusted on read, so it is kept in the user's private cache_dir.
+LEXICON_CACHE_NAME = "lexicon"
+# Bump whenever FALLBACK_WORDS or the filtering in _build_lexicon changes.
+LEXICON_CACHE_VERSION = "1"
 _cached_lexicon: Set[str] | None = None
 
 
@@ -324,6 +337,61 @@ def _load_lexicon() -> Set[str]:
     if _cached_lexicon is not None:
         return _cached_lexicon
 
+    sources = _dictionary_sources()
+    lexicon = _read_cached_lexicon(sources) if sources else None
+    if lexicon is None:
+        lexicon = _build_lexicon()
+        if sources:
+            _write_cached_lexicon(sources, lexicon)
+    _cached_lexicon = lexicon
+    return lexicon
+
+
+def _dictionary_sources() -> Tuple[Tuple[str, int, int], ...]:
+    sources = []
+    for candidate in DICT_CANDIDATE_PATHS:
+        try:
+            stat = os.stat(candidate)
+        except OSError:
+            continue
+        sources.append((candidate, stat.st_mtime_ns, stat.st_size))
+    return tuple(sources)
+
+
+def _lexicon_cache_key(sources: Tuple[Tuple[str, int, int], ...]) -> str:
+    return f"{LEXICON_CACHE_VERSION} {MAX_LEXICON_SIZE} {sources!r}"
+
+
+def _lexicon_cache_path() -> Optional[Path]:
+    directory = cache_dir(LEXICON_CACHE_NAME)
+    return directory / "words.txt" if directory is not None else None
+
+
+def _read_cached_lexicon(sources: Tuple[Tuple[str, int, int], ...]) -> Optional[Set[str]]:
+    path = _lexicon_cache_path()
+    if path is None:
+        return None
+    try:
+        content = path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+    key, _, words = content.partition("\n")
+    if key != _lexicon_cache_key(sources):
+        return None
+    return set(words.split("\n"))
+
+
+def _write_cached_lexicon(sources: Tuple[Tuple[str, int, int], ...], lexicon: Set[str]) -> None:
+    path = _lexicon_cache_path()
+    if path is None:
+        return
+    try:
+        write_text_atomic(path, _lexicon_cache_key(sources) + "\n" + "\n".join(lexicon))
+    except OSError:
+        pass
+
+
+def _build_lexicon() -> Set[str]:
     lexicon: Set[str] = set(word.lower() for word in FALLBACK_WORDS)
     for candidate in DICT_CANDIDATE_PATHS:
         if len(lexicon) >= MAX_LEXICON_SIZE:
@@ -341,31 +409,35 @@ def _load_lexicon() -> Set[str]:
                         break
         except OSError:
             continue
-    _cached_lexicon = lexicon
     return lexicon
 
 
 def _replace_smart_punctuation(text: str) -> str:
-    def repl(match: re.Match[str]) -> str:
-        char = match.group(0)
-        return SMART_REPLACEMENTS.get(char, char)
-
-    return NBSP_RE.sub(" ", SMART_PUNCTUATION_RE.sub(repl, text))
+    for char, replacement in _PUNCTUATION_REPLACEMENTS:
+        if char in text:
+            text = text.replace(char, replacement)
+    return text
 
 
 def _remove_urls(text: str) -> str:
+    # These plain scans are far cheaper than URL_RE's, and most prose has no URLs.
+    if "://" not in text and not WWW_RE.search(text):
+        return text
     return URL_RE.sub(" ", text)
 
 
 def _remove_references(text: str) -> str:
-    text = BRACKET_REFERENCE_RE.sub(" ", text)
-    return PAREN_FOOTNOTE_RE.sub(" ", text)
+    if "[" in text:
+        text = BRACKET_REFERENCE_RE.sub(" ", text)
+    if "(" in text:
+        text = PAREN_FOOTNOTE_RE.sub(" ", text)
+    return text
 
 
 def _fix_hyphenation_artifacts(text: str) -> str:
-    text = re.sub(r"(?<=[A-Za-z])-\s*\n\s*(?=[A-Za-z])", "", text)
-    text = re.sub(r"(?<=[A-Za-z])\n(?=[A-Za-z])", " ", text)
-    return text
+    if "-" in text:
+        text = HYPHEN_BREAK_RE.sub("", text)
+    return SOFT_LINE_BREAK_RE.sub(" ", text)
 
 
 def _split_camel_case(text: str) -> str:
@@ -392,15 +464,22 @@ def _find_lexicon_split(original: str, lexicon: Set[str], depth: int = 0) -> Lis
 
 
 def _split_merged_words(text: str, lexicon: Set[str]) -> str:
+    # Books repeat the same long words constantly; resolve each distinct word
+    # once per call instead of re-running the recursive split search.
+    resolved: Dict[str, str] = {}
+
     def repl(match: re.Match[str]) -> str:
         word = match.group(0)
-        if len(word) > 30:
-            return word
-        lower = word.lower()
-        if lower in lexicon:
-            return word
-        split = _find_lexicon_split(word, lexicon)
-        return " ".join(split) if split else word
+        cached = resolved.get(word)
+        if cached is not None:
+            return cached
+        if len(word) > 30 or word.lower() in lexicon:
+            result = word
+        else:
+            split = _find_lexicon_split(word, lexicon)
+            result = " ".join(split) if split else word
+        resolved[word] = result
+        return result
 
     return MERGED_WORD_RE.sub(repl, text)
 
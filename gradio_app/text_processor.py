@@ -1,36 +1,89 @@
 from __future__ import annotations
 
+import math
+import random
 import re
 import time
-from typing import Callable, List, Optional
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
 
-from .llm_service import LLMService, ProcessOptions, llm_service
+from .llm_service import LLMService, ProcessOptions, estimate_tokens, llm_service
 from .models import (
     CleaningOptions,
     ProcessingConfig,
     ProcessingProgress,
     ProcessingSummary,
 )
-from .text_cleaner import apply_deterministic_cleaning
+from .text_cleaner import DeterministicCleaningResult, apply_deterministic_cleaning
+
+MAX_LOG_LINES = 200
+# Seconds between streamed summaries; each one re-joins the text so far.
+SUMMARY_INTERVAL = 0.5
+MAX_CHUNK_ATTEMPTS = 2
+RETRY_BASE_DELAY = 0.5
+MAX_RETRY_DELAY = 8.0
+SENTENCE_RE = re.compile(r"[^.!?]+(?:[.!?]+|$)")
+
+
+@dataclass(slots=True)
+class _ChunkOutcome:
+    text: str
+    success: bool = False
+    retry_count: int = 0
+    elapsed_ms: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost: float = 0.0
+    applied_steps: List[str] = field(default_factory=list)
+    logs: List[str] = field(default_factory=list)
+
+
+def _empty_summary(text_path: Optional[Path] = None) -> ProcessingSummary:
+    # Built fresh each time: the summary and its lists are mutable.
+    return ProcessingSummary(
+        text="",
+        total_chunks=0,
+        total_input_tokens=0,
+        total_output_tokens=0,
+        total_cost=0.0,
+        applied_cleaning_steps=[],
+        logs=[],
+        text_path=text_path,
+    )
 
 
 class TextProcessor:
     def __init__(self, service: LLMService | None = None) -> None:
         self.service = service or llm_service
 
-    def split_into_chunks(self, text: str, batch_size: int) -> List[str]:
-        sentences = re.findall(r"[^.!?]+(?:[.!?]+|$)", text) or [text]
-        sentences = [s.strip() for s in sentences if s.strip()]
+    def split_into_chunks(self, text: str, batch_size: int, max_tokens: int = 0) -> List[str]:
+        sentences = [s for s in map(str.strip, SENTENCE_RE.findall(text) or [text]) if s]
+        if max_tokens > 0:
+            return self._pack_by_tokens(sentences, max_tokens)
+        # The UI slider may hand over a float; below 1 behaves like one sentence per chunk.
+        size = max(1, int(batch_size))
+        return [" ".join(sentences[i : i + size]) for i in range(0, len(sentences), size)]
+
+    @staticmethod
+    def _pack_by_tokens(sentences: List[str], max_tokens: int) -> List[str]:
+        # Greedy: a sentence larger than the budget still gets a chunk of its own.
         chunks: List[str] = []
         current: List[str] = []
+        current_tokens = 0
         for sentence in sentences:
-            current.append(sentence)
-            if len(current) >= batch_size:
+            tokens = estimate_tokens(sentence)
+            if current and current_tokens + tokens > max_tokens:
                 chunks.append(" ".join(current))
                 current = []
+                current_tokens = 0
+            current.append(sentence)
+            current_tokens += tokens
         if current:
             chunks.append(" ".join(current))
-        return [chunk for chunk in chunks if chunk]
+        return chunks
 
     def process_text(
         self,
@@ -38,96 +91,209 @@ class TextProcessor:
         config: ProcessingConfig,
         on_progress: Optional[Callable[[ProcessingProgress], None]] = None,
     ) -> ProcessingSummary:
-        chunks = self.split_into_chunks(text, config.batch_size)
+        # Only the final summary is wanted, so the text is joined once.
+        summary: Optional[ProcessingSummary] = None
+        for summary in self._iter_summaries(text, config, on_progress, math.inf):
+            pass
+        assert summary is not None
+        return summary
+
+    def iter_process_text(
+        self,
+        text: str,
+        config: ProcessingConfig,
+        on_progress: Optional[Callable[[ProcessingProgress], None]] = None,
+    ) -> Iterator[ProcessingSummary]:
+        """Process ``text`` chunk by chunk, yielding running summaries as chunks complete.
+
+        Up to ``config.parallelism`` chunks are sent to the LLM at once; results
+        are still assembled in chunk order. A summary is yielded at most every
+        ``SUMMARY_INTERVAL`` seconds, since each one joins all text so far, and
+        always after the last chunk; that one covers the whole text. With
+        ``config.output_path`` set, the text is streamed to that file instead
+        and each summary's ``text`` is empty. ``on_progress`` still fires for
+        every chunk.
+        """
+        return self._iter_summaries(text, config, on_progress, SUMMARY_INTERVAL)
+
+    def _iter_summaries(
+        self,
+        text: str,
+        config: ProcessingConfig,
+        on_progress: Optional[Callable[[ProcessingProgress], None]],
+        min_interval: float,
+    ) -> Iterator[ProcessingSummary]:
+        chunks = self.split_into_chunks(text, config.batch_size, config.max_chunk_tokens)
+        if not chunks:
+            # Nothing to send: skip the thread pool, but still leave the
+            # promised (empty) output file behind.
+            if config.output_path:
+                config.output_path.write_text("", encoding="utf-8")
+            yield _empty_summary(config.output_path)
+            return
         total_chunks = len(chunks)
         processed: List[str] = []
         applied_steps: List[str] = []
-        logs: List[str] = []
+        # Only the most recent lines are shown, so long runs keep a bounded tail.
+        logs: Deque[str] = deque(maxlen=MAX_LOG_LINES)
 
         total_input_tokens = 0
         total_output_tokens = 0
         total_cost = 0.0
 
-        durations_total = 0.0
-
-        for idx, chunk in enumerate(chunks):
-            start_time = time.perf_counter()
-            retry_count = 0
-            success = False
-            processed_chunk = chunk
-
-            while retry_count < 2 and not success:
-                try:
-                    options = ProcessOptions(
-                        text=chunk,
-                        cleaning_options=config.cleaning_options,
-                        speaker_config=config.speaker_config,
-                        model_source=config.model_source,
-                        model_name=config.model_name,
-                        ollama_model_name=config.ollama_model_name,
-                        temperature=config.temperature,
-                        custom_instructions=config.custom_instructions,
-                        single_pass=config.single_pass,
-                        llm_cleaning_disabled=config.llm_cleaning_disabled,
-                        extended_examples=config.extended_examples,
+        parallelism = max(1, config.parallelism)
+        run_start = last_yield = time.perf_counter()
+        output = open(config.output_path, "w", encoding="utf-8") if config.output_path else None
+        executor = ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix="voiceforge-llm")
+        # (future, is_first) per chunk; repeated chunk text (running headers,
+        # boilerplate) shares the first occurrence's request. Only text that
+        # appears again keeps its future, and only until its last repeat, so
+        # finished outputs are not all held in memory.
+        in_flight: Deque[Tuple[Future[_ChunkOutcome], bool]] = deque()
+        uses_left = Counter(chunks)
+        shared: Dict[str, Future[_ChunkOutcome]] = {}
+        next_index = 0
+        try:
+            for idx in range(total_chunks):
+                while next_index < total_chunks and len(in_flight) < parallelism:
+                    chunk = chunks[next_index]
+                    future = shared.pop(chunk, None)
+                    is_first = future is None
+                    if future is None:
+                        future = executor.submit(self._process_chunk, next_index, chunk, config)
+                    uses_left[chunk] -= 1
+                    if uses_left[chunk]:
+                        shared[chunk] = future
+                    else:
+                        del uses_left[chunk]
+                    in_flight.append((future, is_first))
+                    next_index += 1
+                future, is_first = in_flight.popleft()
+                outcome = future.result()
+
+                if output is not None:
+                    if idx:
+                        output.write("\n\n")
+                    output.write(outcome.text)
+                    output.flush()
+                else:
+                    processed.append(outcome.text)
+                # A reused chunk cost nothing, so it reports zero usage.
+                chunk_input_tokens = outcome.input_tokens if is_first else 0
+                chunk_output_tokens = outcome.output_tokens if is_first else 0
+                if is_first:
+                    total_input_tokens += chunk_input_tokens
+                    total_output_tokens += chunk_output_tokens
+                    total_cost += outcome.cost
+                    applied_steps.extend(outcome.applied_steps)
+                    logs.extend(outcome.logs)
+                else:
+                    logs.append(f"Chunk {idx + 1}: same text as an earlier chunk; reused its result.")
+
+                if on_progress:
+                    # Wall-clock average so the ETA reflects concurrent requests.
+                    avg_chunk_ms = (time.perf_counter() - run_start) * 1000 / (idx + 1)
+                    remaining = total_chunks - (idx + 1)
+                    on_progress(
+                        ProcessingProgress(
+                            chunk_index=idx,
+                            processed_text=outcome.text,
+                            status="success" if outcome.success else "failed",
+                            retry_count=outcome.retry_count,
+                            last_chunk_ms=int(outcome.elapsed_ms),
+                            avg_chunk_ms=avg_chunk_ms,
+                            eta_ms=max(0, int(avg_chunk_ms * remaining)),
+                            input_tokens=chunk_input_tokens,
+                            output_tokens=chunk_output_tokens,
+                            total_input_tokens=total_input_tokens,
+                            total_output_tokens=total_output_tokens,
+                            total_cost=total_cost,
+                        )
                     )
-                    result = self.service.process_chunk(options)
-                    processed_chunk = result.text
-                    total_input_tokens += result.input_tokens
-                    total_output_tokens += result.output_tokens
-                    total_cost += result.input_cost + result.output_cost
-                    applied_steps.extend(result.applied_steps)
-                    success = self.service.validate_output(chunk, processed_chunk)
-                except Exception as exc:  # noqa: BLE001 - surface any errors
-                    retry_count += 1
-                    logs.append(f"Chunk {idx + 1}: {type(exc).__name__}: {exc}")
-                    if retry_count >= 2:
-                        processed_chunk = chunk
-                        logs.append(f"Chunk {idx + 1}: falling back to original text after errors.")
-                        break
+
+                now = time.perf_counter()
+                if idx + 1 < total_chunks and now - last_yield < min_interval:
                     continue
+                last_yield = now
+                yield ProcessingSummary(
+                    text="\n\n".join(processed),
+                    total_chunks=total_chunks,
+                    total_input_tokens=total_input_tokens,
+                    total_output_tokens=total_output_tokens,
+                    total_cost=total_cost,
+                    applied_cleaning_steps=applied_steps,
+                    logs=list(logs),
+                    completed_chunks=idx + 1,
+                    text_path=config.output_path,
+                )
+        finally:
+            # Runs when the consumer stops early too: drop chunks not yet started.
+            executor.shutdown(wait=False, cancel_futures=True)
+            if output is not None:
+                output.close()
 
-                if not success:
-                    retry_count += 1
-                    time.sleep(1)
-
-            processed.append(processed_chunk)
-            elapsed = (time.perf_counter() - start_time) * 1000
-            durations_total += elapsed
-            avg_chunk_ms = durations_total / (idx + 1)
-            remaining = total_chunks - (idx + 1)
-            eta_ms = max(0, int(avg_chunk_ms * remaining))
-
-            progress = ProcessingProgress(
-                chunk_index=idx,
-                processed_text=processed_chunk,
-                status="success" if success else "failed",
-                retry_count=retry_count,
-                last_chunk_ms=int(elapsed),
-                avg_chunk_ms=avg_chunk_ms,
-                eta_ms=eta_ms,
-                input_tokens=total_input_tokens,
-                output_tokens=total_output_tokens,
-                total_input_tokens=total_input_tokens,
-                total_output_tokens=total_output_tokens,
-                total_cost=total_cost,
-            )
-            if on_progress:
-                on_progress(progress)
-
-        final_text = "\n\n".join(processed)
-        return ProcessingSummary(
-            text=final_text,
-            total_chunks=total_chunks,
-            total_input_tokens=total_input_tokens,
-            total_output_tokens=total_output_tokens,
-            total_cost=total_cost,
-            applied_cleaning_steps=applied_steps,
-            logs=logs,
+    def _process_chunk(self, idx: int, chunk: str, config: ProcessingConfig) -> _ChunkOutcome:
+        outcome = _ChunkOutcome(text=chunk)
+        start_time = time.perf_counter()
+        retry_count = 0
+        success = False
+        options = ProcessOptions(
+            text=chunk,
+            cleaning_options=config.cleaning_options,
+            speaker_config=config.speaker_config,
+            model_source=config.model_source,
+            model_name=config.model_name,
+            ollama_model_name=config.ollama_model_name,
+            temperature=config.temperature,
+            custom_instructions=config.custom_instructions,
+            single_pass=config.single_pass,
+            llm_cleaning_disabled=config.llm_cleaning_disabled,
+            extended_examples=config.extended_examples,
         )
 
-    def deterministic_clean(self, text: str, options: CleaningOptions) -> ProcessingSummary:
-        result = apply_deterministic_cleaning(text, options)
+        while retry_count < MAX_CHUNK_ATTEMPTS and not success:
+            try:
+                result = self.service.process_chunk(options)
+                outcome.text = result.text
+                outcome.input_tokens += result.input_tokens
+                outcome.output_tokens += result.output_tokens
+                outcome.cost += result.input_cost + result.output_cost
+                outcome.applied_steps.extend(result.applied_steps)
+                success = self.service.validate_output(chunk, outcome.text)
+            except Exception as exc:  # noqa: BLE001 - surface any errors
+                # The service has already retried transient provider errors.
+                retry_count += 1
+                outcome.text = chunk
+                outcome.logs.append(f"Chunk {idx + 1}: {type(exc).__name__}: {exc}")
+                outcome.logs.append(f"Chunk {idx + 1}: falling back to original text after errors.")
+                break
+
+            if not success:
+                retry_count += 1
+                if retry_count < MAX_CHUNK_ATTEMPTS:
+                    self._backoff(idx, retry_count, outcome)
+
+        outcome.success = success
+        outcome.retry_count = retry_count
+        outcome.elapsed_ms = (time.perf_counter() - start_time) * 1000
+        return outcome
+
+    @staticmethod
+    def _backoff(idx: int, retry_count: int, outcome: _ChunkOutcome) -> None:
+        # Jitter keeps parallel chunks that failed together from retrying in lockstep.
+        delay = min(RETRY_BASE_DELAY * 2 ** (retry_count - 1), MAX_RETRY_DELAY)
+        delay += random.uniform(0, RETRY_BASE_DELAY)
+        outcome.logs.append(f"Chunk {idx + 1}: retrying in {delay:.1f}s")
+        time.sleep(delay)
+
+    @staticmethod
+    def deterministic_clean(text: str, options: CleaningOptions) -> ProcessingSummary:
+        if not text or text.isspace():
+            return _empty_summary()
+        return TextProcessor.cleaning_summary(apply_deterministic_cleaning(text, options))
+
+    @staticmethod
+    def cleaning_summary(result: DeterministicCleaningResult) -> ProcessingSummary:
         return ProcessingSummary(
             text=result.text,
             total_chunks=1,
@@ -136,4 +302,5 @@ class TextProcessor:
             total_cost=0.0,
             applied_cleaning_steps=result.applied,
             logs=[],
+            completed_chunks=1,
         )
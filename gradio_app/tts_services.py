@@ -4,13 +4,23 @@ import json
 import os
 import subprocess
 import sys
+import threading
 import uuid
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Deque, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import gradio as gr
 
+from .storage import json_loads, write_text_atomic
+
+# Long syntheses print a line per step; only the tail is kept for the UI log.
+MAX_WORKER_LOG_LINES = 2000
+# A resident worker idle this long exits and frees its VRAM; 0 keeps it loaded.
+RESIDENT_WORKER_IDLE_SECONDS = float(os.getenv("VOICEFORGE_TTS_IDLE_SECONDS", "600"))
+WORKER_STOP_TIMEOUT = 10.0
+
 
 @dataclass
 class WorkerEvent:
@@ -31,9 +41,13 @@ def _ensure_directory(path: Path) -> Path:
 
 
 def _parse_event(line: str) -> WorkerEvent:
+    # Events are JSON objects; anything else is plain log output from the
+    # worker or its libraries and is not worth a failed parse.
+    if not line.startswith("{"):
+        return WorkerEvent(event="log", message=line.strip(), payload={})
     try:
-        payload = json.loads(line)
-    except json.JSONDecodeError:
+        payload = json_loads(line)
+    except ValueError:
         return WorkerEvent(event="log", message=line.strip(), payload={})
     event = str(payload.get("event", "log"))
     return WorkerEvent(
@@ -45,15 +59,29 @@ def _parse_event(line: str) -> WorkerEvent:
     )
 
 
-def _run_worker(command: Sequence[str]) -> Tuple[List[WorkerEvent], str]:
-    process = subprocess.Popen(
+def _spawn_worker(command: Sequence[str], stdin: Optional[int] = None) -> subprocess.Popen:
+    env = dict(os.environ)
+    # Unbuffered so library output arrives as it is printed, not in blocks;
+    # UTF-8 both ways because Windows otherwise gives redirected streams the
+    # ANSI code page, which cannot carry the tokenizer output some models print.
+    env.update(PYTHONUNBUFFERED="1", PYTHONUTF8="1", PYTHONIOENCODING="utf-8")
+    return subprocess.Popen(
         command,
+        stdin=stdin,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         text=True,
+        encoding="utf-8",
+        errors="replace",
+        bufsize=1,
+        env=env,
     )
-    events: List[WorkerEvent] = []
-    logs: List[str] = []
+
+
+def _run_worker(command: Sequence[str]) -> Tuple[List[WorkerEvent], str]:
+    process = _spawn_worker(command)
+    events: Deque[WorkerEvent] = deque(maxlen=MAX_WORKER_LOG_LINES)
+    logs: Deque[str] = deque(maxlen=MAX_WORKER_LOG_LINES)
 
     assert process.stdout is not None
     for line in process.stdout:
@@ -67,10 +95,109 @@ def _run_worker(command: Sequence[str]) -> Tuple[List[WorkerEvent], str]:
 
     code = process.wait()
     if code != 0:
-        preview = "\n".join(logs[-20:])
-        raise RuntimeError(f"Worker exited with status {code}. Logs:\n{preview}")
-
-    return events, "\n".join(logs)
+        raise RuntimeError(f"Worker exited with status {code}. Logs:\n{_log_preview(logs)}")
+
+    return list(events), "\n".join(logs)
+
+
+def _log_preview(logs: Deque[str]) -> str:
+    return "\n".join(list(logs)[-20:])
+
+
+class _ResidentWorker:
+    """A worker started once in ``serve`` mode and fed one JSON request per line.
+
+    Keeps the model loaded between jobs instead of paying interpreter start-up
+    and model initialisation on every call. Requests are serialised; the worker
+    is restarted if it has exited, and exits itself when its stdin closes, which
+    is how ``stop`` and the idle timeout release the model.
+    """
+
+    def __init__(self, command: Sequence[str], idle_timeout: float = 0.0) -> None:
+        self._command = list(command)
+        self._idle_timeout = idle_timeout
+        self._process: Optional[subprocess.Popen] = None
+        self._idle_timer: Optional[threading.Timer] = None
+        self._lock = threading.Lock()
+
+    def _ensure_process(self) -> subprocess.Popen:
+        if self._process is None or self._process.poll() is not None:
+            self._process = _spawn_worker(self._command, stdin=subprocess.PIPE)
+        return self._process
+
+    def stop(self) -> None:
+        """Shut the worker down; the next request starts a fresh one."""
+        with self._lock:
+            self._stop_locked()
+
+    def _stop_locked(self) -> None:
+        self._cancel_idle_timer_locked()
+        process, self._process = self._process, None
+        if process is None:
+            return
+        assert process.stdin is not None and process.stdout is not None
+        try:
+            process.stdin.close()
+            process.wait(timeout=WORKER_STOP_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+        process.stdout.close()
+
+    def _cancel_idle_timer_locked(self) -> None:
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def _arm_idle_timer_locked(self) -> None:
+        if self._idle_timeout <= 0 or self._process is None or self._process.poll() is not None:
+            return
+
+        def expire() -> None:
+            with self._lock:
+                # A request made since this timer was armed has replaced it.
+                if self._idle_timer is timer:
+                    self._stop_locked()
+
+        timer = threading.Timer(self._idle_timeout, expire)
+        timer.daemon = True
+        self._idle_timer = timer
+        timer.start()
+
+    def request(self, payload: Dict[str, object]) -> Tuple[List[WorkerEvent], str]:
+        events: Deque[WorkerEvent] = deque(maxlen=MAX_WORKER_LOG_LINES)
+        logs: Deque[str] = deque(maxlen=MAX_WORKER_LOG_LINES)
+        failed = False
+        with self._lock:
+            self._cancel_idle_timer_locked()
+            try:
+                process = self._ensure_process()
+                assert process.stdin is not None and process.stdout is not None
+                try:
+                    process.stdin.write(json.dumps(payload) + "\n")
+                    process.stdin.flush()
+                except OSError as exc:
+                    process.kill()
+                    raise RuntimeError(f"Worker exited before accepting the request: {exc}") from exc
+                for line in process.stdout:
+                    stripped = line.strip()
+                    if not stripped:
+                        continue
+                    event = _parse_event(stripped)
+                    if event.event == "done" and event.payload.get("job_id") == payload.get("job_id"):
+                        break
+                    failed = failed or event.event == "error"
+                    logs.append(stripped)
+                    events.append(event)
+                else:
+                    code = process.wait()
+                    raise RuntimeError(f"Worker exited with status {code}. Logs:\n{_log_preview(logs)}")
+            finally:
+                self._arm_idle_timer_locked()
+
+        if failed:
+            raise RuntimeError(f"Worker request failed. Logs:\n{_log_preview(logs)}")
+        return list(events), "\n".join(logs)
 
 
 def _summarize(events: Iterable[WorkerEvent], fallback: str) -> Tuple[str, Optional[str]]:
@@ -98,6 +225,7 @@ class IndexTTSService:
         self.root_dir = _ensure_directory(base_dir)
         self.models_dir = _ensure_directory(Path(os.getenv("INDEXTTS_MODELS", self.root_dir / "models")))
         self.jobs_dir = _ensure_directory(self.root_dir / "jobs")
+        self._server = _ResidentWorker(self._command() + ["serve"], RESIDENT_WORKER_IDLE_SECONDS)
 
     def _command(self) -> List[str]:
         return [
@@ -110,36 +238,36 @@ class IndexTTSService:
         ]
 
     def download_models(self) -> Tuple[str, str]:
+        # Release the resident model first; the next synthesis starts a new
+        # worker that loads the downloaded files.
+        self._server.stop()
         events, log = _run_worker(self._command() + ["download"])
         summary, _ = _summarize(events, "Download finished")
         return summary, log
 
     def load_models(self) -> Tuple[str, str]:
+        # The check loads its own copy; do not hold a second one in VRAM.
+        self._server.stop()
         events, log = _run_worker(self._command() + ["load"])
         summary, _ = _summarize(events, "Models loaded")
         return summary, log
 
-    def synthesize(self, voice_path: Path, text: str, steps: int = 25) -> Tuple[str, str, Optional[Path]]:
+    def synthesize(self, voice_path: Path, text: str) -> Tuple[str, str, Optional[Path]]:
         if not voice_path.exists():
             raise gr.Error("Voice prompt file missing")
         if not text.strip():
             raise gr.Error("Provide text to synthesize")
         job_id = uuid.uuid4().hex
-        text_file = self.jobs_dir / f"{job_id}.txt"
-        text_file.write_text(text, encoding="utf-8")
         output_path = self.jobs_dir / f"{job_id}.wav"
-        command = self._command() + [
-            "synthesize",
-            "--voice",
-            str(voice_path),
-            "--text",
-            str(text_file),
-            "--output",
-            str(output_path),
-            "--steps",
-            str(int(max(1, steps))),
-        ]
-        events, log = _run_worker(command)
+        # The resident worker takes the text inline; no job file to stage or clean up.
+        events, log = self._server.request(
+            {
+                "job_id": job_id,
+                "voice": str(voice_path),
+                "text": text,
+                "output": str(output_path),
+            }
+        )
         summary, reported_output = _summarize(events, "Synthesis complete")
         if reported_output and Path(reported_output).exists():
             output_path = Path(reported_output)
@@ -193,7 +321,7 @@ class VibeVoiceService:
                 raise gr.Error(f"Voice reference missing: {voice}")
         job_id = uuid.uuid4().hex
         text_file = self.jobs_dir / f"{job_id}.txt"
-        text_file.write_text(text, encoding="utf-8")
+        write_text_atomic(text_file, text)
         output_path = self.jobs_dir / f"{job_id}.wav"
         args: List[str] = list(self._command())
         args += [
@@ -213,7 +341,10 @@ class VibeVoiceService:
             args += ["--guidance-scale", str(temperature)]
         if model_id and model_id.strip():
             args += ["--model-id", model_id.strip()]
-        events, log = _run_worker(args)
+        try:
+            events, log = _run_worker(args)
+        finally:
+            text_file.unlink(missing_ok=True)
         summary, reported = _summarize(events, "Synthesis complete")
         if reported and Path(reported).exists():
             output_path = Path(reported)
@@ -261,7 +392,7 @@ class QwenTTSService:
             raise gr.Error("Provide text to synthesize")
         job_id = uuid.uuid4().hex
         text_file = self.jobs_dir / f"{job_id}.txt"
-        text_file.write_text(text, encoding="utf-8")
+        write_text_atomic(text_file, text)
         output_path = self.jobs_dir / f"{job_id}.wav"
         command = self._command() + [
             "synthesize",
@@ -282,7 +413,10 @@ class QwenTTSService:
             "--gap-ms",
             str(int(max(0, gap_ms))),
         ]
-        events, log = _run_worker(command)
+        try:
+            events, log = _run_worker(command)
+        finally:
+            text_file.unlink(missing_ok=True)
         summary, reported_output = _summarize(events, "Synthesis complete")
         if reported_output and Path(reported_output).exists():
             output_path = Path(reported_output)
@@ -8,6 +8,8 @@ What it does
 - Optionally runs inference using:
   - Ollama (set OLLAMA_BASE_URL, default http://localhost:11434, model env LLM_TEST_OLLAMA=qwen3:8b)
   - HuggingFace Inference (set HUGGINGFACE_API_TOKEN, model env LLM_TEST_MODEL)
+  The test configurations are sent concurrently; start Ollama with OLLAMA_NUM_PARALLEL=5
+  (or more) so it serves them together instead of queueing them.
 - Analyzes outputs and writes a concise report to logs/llm-py-report.txt
 
 Usage examples
@@ -30,10 +32,12 @@ import os
 import re
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from urllib import request
+from urllib import error, request
 
 
 # -------- Sample + Options --------
@@ -66,7 +70,7 @@ def generate_sample_dialogue() -> str:
     return " ".join(parts)
 
 
-@dataclass
+@dataclass(frozen=True)
 class CleaningOptions:
     replaceSmartQuotes: bool = True
     fixOcrErrors: bool = True
@@ -96,6 +100,12 @@ class SpeakerConfig:
 
 
 def build_cleaning_prompt(text: str, opt: CleaningOptions) -> str:
+    return f"{_cleaning_instructions(opt)}Text:\n{text}\n\nCleaned:"
+
+
+@lru_cache(maxsize=32)
+def _cleaning_instructions(opt: CleaningOptions) -> str:
+    # Everything ahead of the text depends only on the options.
     tasks: List[str] = []
     if opt.replaceSmartQuotes:
         tasks.append('* Replace all smart quotes (“ ” ‘ ’) with standard ASCII quotes (" and \").')
@@ -120,7 +130,7 @@ def build_cleaning_prompt(text: str, opt: CleaningOptions) -> str:
             'book, or appendix heading. Preserve the heading text and do not invent divisions.'
         )
 
-    prompt = (
+    return (
         "You are a TTS preprocessing assistant. Clean and repair the text using ONLY the listed transformations.\n\n"
         "Preprocessing Steps:\n" + "\n".join(tasks) + "\n\n"
         "Rules:\n"
@@ -128,21 +138,26 @@ def build_cleaning_prompt(text: str, opt: CleaningOptions) -> str:
         "- Only fix errors; do not rewrite or rephrase.\n"
         "- Maintain paragraph structure.\n"
         "- Return ONLY the cleaned text, no explanations.\n\n"
-        f"Text:\n{text}\n\nCleaned:"
     )
-    return prompt
 
 
 def read_template() -> Optional[str]:
-    p = Path.cwd() / "sample_prompt.md"
+    return _read_template_in(str(Path.cwd()))
+
+
+@lru_cache(maxsize=1)
+def _read_template_in(cwd: str) -> Optional[str]:
+    # Every stage-2 prompt renders the same template; read it once per run.
+    p = Path(cwd) / "sample_prompt.md"
     return p.read_text(encoding="utf-8") if p.exists() else None
 
 
+PLACEHOLDER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+
 def render_template(tpl: str, vars: Dict[str, str]) -> str:
-    out = tpl
-    for k, v in vars.items():
-        out = out.replace("{{" + k + "}}", v)
-    return out
+    # One pass over the template; unknown placeholders are left as written.
+    return PLACEHOLDER_RE.sub(lambda m: vars.get(m.group(1), m.group(0)), tpl)
 
 
 def build_stage2_prompt(text: str, sc: SpeakerConfig, include_examples: bool = True) -> str:
@@ -253,15 +268,33 @@ def http_get_json(url: str, headers: Optional[Dict[str, str]] = None, timeout: i
             return resp.status, {}, body
 
 
-def run_ollama(prompt: str, model: str = "qwen3:8b") -> str:
+def run_ollama(prompt: str, model: str = "qwen3:8b", timeout: int = 120) -> str:
     base = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
-    status, js, raw = http_post_json(
+    payload = {"model": model, "prompt": prompt, "stream": True, "keep_alive": "15m"}
+    req = request.Request(
         f"{base}/api/generate",
-        {"model": model, "prompt": prompt, "stream": False},
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
     )
-    if status != 200:
-        raise RuntimeError(f"ollama error {status}: {raw[:200]}")
-    return js.get("response") or js.get("final_response") or js.get("message", {}).get("content", "")
+    # Streamed as NDJSON, so the timeout bounds the gap between tokens rather
+    # than the whole generation.
+    parts: List[str] = []
+    try:
+        with request.urlopen(req, timeout=timeout) as resp:
+            for line in resp:
+                if not line.strip():
+                    continue
+                event = json.loads(line)
+                if event.get("error"):
+                    raise RuntimeError(f"ollama error: {str(event['error'])[:200]}")
+                parts.append(event.get("response") or "")
+                if event.get("done"):
+                    break
+    except error.HTTPError as exc:
+        # Ollama explains failures (e.g. an unpulled model) in the error body.
+        raw = exc.read().decode("utf-8", errors="ignore")
+        raise RuntimeError(f"ollama error {exc.code}: {raw[:200]}") from exc
+    return "".join(parts)
 
 
 def run_hf(prompt: str, model: str, token: str) -> str:
@@ -282,11 +315,15 @@ def run_hf(prompt: str, model: str, token: str) -> str:
 # -------- Analysis & Report --------
 
 
+LINE_SPLIT_RE = re.compile(r"\r?\n")
+LABEL_RE = re.compile(r"^(Speaker\s+\d+:|\[\d+\]:|Narrator:)\s")
+ATTRIBUTION_VERB_RE = re.compile(r"\b(said|asked|replied|whispered)\b", re.I)
+
+
 def analyze_output(text: str, label_format: str, include_narrator: bool, narrator_mode: str) -> List[str]:
-    lines = [l.strip() for l in re.split(r"\r?\n", text) if l.strip()]
+    lines = [l.strip() for l in LINE_SPLIT_RE.split(text) if l.strip()]
     issues: List[str] = []
-    label_ok = re.compile(r"^(Speaker\s+\d+:|\[\d+\]:|Narrator:)\s").match
-    bad = [l for l in lines if not label_ok(l)]
+    bad = [l for l in lines if not LABEL_RE.match(l)]
     if bad:
         issues.append(f"Unlabeled lines: {bad[:3]}")
     narrator_lines = [l for l in lines if l.lower().startswith("narrator:")]
@@ -297,7 +334,7 @@ def analyze_output(text: str, label_format: str, include_narrator: bool, narrato
     if any('"' in l for l in lines):
         issues.append("Quotes still present in output.")
     if narrator_mode == "remove":
-        said = [l for l in lines if not l.lower().startswith("narrator:") and re.search(r"\b(said|asked|replied|whispered)\b", l, re.I)]
+        said = [l for l in lines if not l.lower().startswith("narrator:") and ATTRIBUTION_VERB_RE.search(l)]
         if said:
             issues.append("Attribution verbs in speaker lines under remove mode.")
     if narrator_mode != "remove" and not narrator_lines:
@@ -305,6 +342,17 @@ def analyze_output(text: str, label_format: str, include_narrator: bool, narrato
     return issues
 
 
+def head_lines(text: str, n: int) -> str:
+    # Only the text up to the n-th newline is split, not the whole output.
+    end = -1
+    for _ in range(n):
+        end = text.find("\n", end + 1)
+        if end == -1:
+            break
+    head = text if end == -1 else text[: end + 1]
+    return "\n".join(head.splitlines()[:n])
+
+
 def ensure_logs_dir() -> Path:
     p = Path.cwd() / "logs"
     p.mkdir(parents=True, exist_ok=True)
@@ -408,10 +456,7 @@ def main() -> None:
         ("speaker+noNarr+two", dict(labelFormat="speaker", includeNarrator=False, narratorAttribution="remove", singlePass=False)),
     ]
 
-    logs = ensure_logs_dir()
-    report_lines: List[str] = []
-
-    for name, cfg in tests:
+    def run_one(name: str, cfg: Dict) -> Tuple[SpeakerConfig, str, int]:
         cfg_sc = SpeakerConfig(
             mode="intelligent",
             speakerCount=3,
@@ -428,12 +473,27 @@ def main() -> None:
             else:
                 if not token:
                     raise RuntimeError("HUGGINGFACE_API_TOKEN not set")
-                    
                 out = run_hf(prompt, model, token)
         except Exception as e:
             out = f"[error] {e}"
         elapsed = int((time.time() - started) * 1000)
 
+        # Written from the worker so the disk write overlaps other tests' requests.
+        try:
+            (logs / f"py-llm-output-{name}.txt").write_text(out, encoding="utf-8")
+        except Exception:
+            pass
+        return cfg_sc, out, elapsed
+
+    logs = ensure_logs_dir()
+    # Each test spends nearly all its time waiting on the model, so send them
+    # together; total time is then the slowest test rather than the sum.
+    with ThreadPoolExecutor(max_workers=len(tests)) as pool:
+        results = list(pool.map(lambda test: run_one(*test), tests))
+
+    report_lines: List[str] = []
+
+    for (name, _cfg), (cfg_sc, out, elapsed) in zip(tests, results):
         if not out.startswith("[error]"):
             issues = analyze_output(out, cfg_sc.labelFormat, cfg_sc.includeNarrator, cfg_sc.narratorAttribution)
         else:
@@ -443,15 +503,10 @@ def main() -> None:
             f"\n=== {name} ({cfg_sc.labelFormat}, narr={cfg_sc.includeNarrator}, attr={cfg_sc.narratorAttribution}) in {elapsed}ms ==="
         )
         report_lines.append(f"Issues: {' | '.join(issues) if issues else 'None'}")
-        sample_out = "\n".join(out.splitlines()[:12])
+        sample_out = head_lines(out, 12)
         report_lines.append("Output (first lines):")
         report_lines.append(sample_out)
 
-        try:
-            (logs / f"py-llm-output-{name}.txt").write_text(out, encoding="utf-8")
-        except Exception:
-            pass
-
     (logs / "llm-py-report.txt").write_text("\n".join(report_lines), encoding="utf-8")
     print(f"\nReport written to {logs / 'llm-py-report.txt'}")
 
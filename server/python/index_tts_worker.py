@@ -403,18 +403,23 @@ def handle_load(args) -> None:
     emit("complete", progress=1.0, message="Models loaded")
 
 
-def handle_synthesize(args) -> None:
-    if not os.path.exists(args.voice):
-        raise FileNotFoundError(f"Voice prompt not found: {args.voice}")
-    if not os.path.exists(args.text):
-        raise FileNotFoundError(f"Text file not found: {args.text}")
-
-    with open(args.text, "r", encoding="utf-8") as text_file:
-        text = text_file.read().strip()
+def _check_synthesis_text(voice: str, text: str) -> str:
+    if not os.path.exists(voice):
+        raise FileNotFoundError(f"Voice prompt not found: {voice}")
+    text = text.strip()
     if not text:
         raise ValueError("Text input is empty")
+    return text
 
-    tts = init_model(args.models_dir)
+
+def _read_synthesis_text(voice: str, text_path: str) -> str:
+    if not os.path.exists(text_path):
+        raise FileNotFoundError(f"Text file not found: {text_path}")
+    with open(text_path, "r", encoding="utf-8") as text_file:
+        return _check_synthesis_text(voice, text_file.read())
+
+
+def _run_synthesis(tts, voice: str, text: str, output: str) -> None:
     def gr_progress(value, desc=None):
         try:
             emit("progress", progress=float(value), message=desc)
@@ -424,12 +429,48 @@ def handle_synthesize(args) -> None:
     tts.gr_progress = gr_progress
     emit("progress", progress=0.25, message="Running synthesis")
     tts.infer(
-        spk_audio_prompt=args.voice,
+        spk_audio_prompt=voice,
         text=text,
-        output_path=args.output,
+        output_path=output,
         verbose=True,
     )
-    emit("complete", progress=1.0, message="Synthesis complete", output_path=args.output)
+    emit("complete", progress=1.0, message="Synthesis complete", output_path=output)
+
+
+def handle_synthesize(args) -> None:
+    text = _read_synthesis_text(args.voice, args.text)
+    tts = init_model(args.models_dir)
+    _run_synthesis(tts, args.voice, text, args.output)
+
+
+def handle_serve(args) -> None:
+    """Synthesize one JSON request per stdin line, keeping the model loaded.
+
+    Each request is {"job_id", "voice", "text", "output"} with the text inline,
+    or "text_file" naming a file as for the synthesize command. Its events are
+    followed by a "done" event
+    carrying the same job_id, whether or not it succeeded. The loop ends when
+    stdin closes, so the worker exits with its parent.
+    """
+    tts = None
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job_id = None
+        try:
+            request = json.loads(line)
+            job_id = request.get("job_id")
+            if "text_file" in request:
+                text = _read_synthesis_text(request["voice"], request["text_file"])
+            else:
+                text = _check_synthesis_text(request["voice"], request["text"])
+            if tts is None:
+                tts = init_model(args.models_dir)
+            _run_synthesis(tts, request["voice"], text, request["output"])
+        except Exception as exc:
+            emit("error", error=str(exc), message="IndexTTS operation failed")
+            traceback.print_exc()
+        emit("done", job_id=job_id)
 
 
 def main() -> None:
@@ -446,6 +487,8 @@ def main() -> None:
     synth_parser.add_argument("--text", required=True)
     synth_parser.add_argument("--output", required=True)
 
+    subparsers.add_parser("serve")
+
     args = parser.parse_args()
     try:
         if args.command == "download":
@@ -454,6 +497,8 @@ def main() -> None:
             handle_load(args)
         elif args.command == "synthesize":
             handle_synthesize(args)
+        elif args.command == "serve":
+            handle_serve(args)
         else:
             raise ValueError(f"Unknown command: {args.command}")
     except Exception as exc:
@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import contextlib
+import io
 import json
+import sys
 import tempfile
 import unittest
 from pathlib import Path
+from types import SimpleNamespace
 
 import chapter_markers as chapters
+import index_tts_worker as index
 import moss_tts_worker as moss
 import qwen_tts_worker as qwen
 
@@ -241,6 +246,61 @@ class WorkerHelpersTest(unittest.TestCase):
             self.assertEqual(parsed.chapter_pause_ms, 750)
             self.assertEqual(parsed.chapter_manifest, "chapters.json")
 
+    def test_index_serve_loads_the_model_once_across_requests(self) -> None:
+        loads = []
+
+        class FakeIndexTTS:
+            def infer(self, spk_audio_prompt, text, output_path, verbose):
+                Path(output_path).write_text(text, encoding="utf-8")
+
+        def fake_init_model(models_dir):
+            loads.append(models_dir)
+            return FakeIndexTTS()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            voice = root / "voice.wav"
+            voice.write_bytes(b"voice")
+            requests = []
+            for job_id, text in (("a", "First line."), ("b", " "), ("c", "Third line.")):
+                requests.append(
+                    {
+                        "job_id": job_id,
+                        "voice": str(voice),
+                        "text": text,
+                        "output": str(root / f"{job_id}.wav"),
+                    }
+                )
+            text_path = root / "d.txt"
+            text_path.write_text("Fourth line.\n", encoding="utf-8")
+            requests.append(
+                {
+                    "job_id": "d",
+                    "voice": str(voice),
+                    "text_file": str(text_path),
+                    "output": str(root / "d.wav"),
+                }
+            )
+            stdin = io.StringIO("".join(json.dumps(request) + "\n" for request in requests))
+            stdout = io.StringIO()
+            original_init_model, original_stdin = index.init_model, sys.stdin
+            index.init_model, sys.stdin = fake_init_model, stdin
+            try:
+                with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(io.StringIO()):
+                    index.handle_serve(SimpleNamespace(models_dir="models"))
+            finally:
+                index.init_model, sys.stdin = original_init_model, original_stdin
+
+            events = [json.loads(line) for line in stdout.getvalue().splitlines()]
+            self.assertEqual(loads, ["models"])
+            self.assertEqual(
+                [event["job_id"] for event in events if event["event"] == "done"], ["a", "b", "c", "d"]
+            )
+            self.assertEqual([event["event"] for event in events].count("error"), 1)
+            self.assertEqual((root / "c.wav").read_text(encoding="utf-8"), "Third line.")
+            self.assertEqual((root / "d.wav").read_text(encoding="utf-8"), "Fourth line.")
+            self.assertFalse((root / "b.wav").exists())
+
     def test_language_normalization(self) -> None:
         self.assertIsNone(moss.normalize_language("Auto"))
         self.assertIsNone(moss.normalize_language("Auto (omit)"))